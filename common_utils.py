@@ -11,22 +11,26 @@ Shared utilities for:
 Includes:
 - logging helpers
 - configurable preflight checks
-- robust subprocess runner with safe decoding (Windows-friendly)
+- robust subprocess runner with safe decoding (Windows-friendly, bounded streamed output)
 - docker mount path conversion (cross-platform)
 - safe file helpers (unlink/restore/backup)
-- target discovery helpers
+- target discovery helpers (parallel directory walk)
 - folder copy/clear helpers
 - summary helpers
 """
 
 from __future__ import annotations
 
+import functools
 import os
 import sys
 import shutil
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Optional, Iterable, Sequence, List, Tuple, Dict, Any
+from typing import Optional, Iterable, Sequence, List, Tuple, Dict, Any, Callable
 
 
 # -------------------------
@@ -64,16 +68,39 @@ def require_dir(path: Path, desc: str = "Directory"):
 
 
 
+# Lines of stdout/stderr retained per stream by run_cmd (older output is dropped)
+RUN_CMD_TAIL_LINES = 10_000
+
+
+def _drain_pipe(pipe, tail: deque, tee) -> None:
+    """Read `pipe` line by line into the bounded `tail`, optionally echoing to `tee`."""
+    try:
+        for line in iter(pipe.readline, b""):
+            tail.append(line)
+            if tee is not None:
+                tee.write(line.decode("utf-8", errors="replace"))
+                tee.flush()
+    finally:
+        pipe.close()
+
+
 def run_cmd(
     cmd: list[str],
     cwd: Optional[Path] = None,
     check: bool = True,
-    stopScript: bool = True
+    stopScript: bool = True,
+    verbose: bool = False,
+    timeout: Optional[float] = None,
 ) -> subprocess.CompletedProcess:
     """
     Run a command capturing output as bytes and decoding safely.
     Prevents UnicodeDecodeError on Windows (cp1252).
 
+    Output is streamed through two reader threads: only the last RUN_CMD_TAIL_LINES
+    lines of each stream are kept (memory stays bounded on huge build logs), and
+    verbose=True echoes them live to stdout.
+    timeout (seconds): the process is killed when exceeded (exit code 124).
+
     Behavior:
     - If stopScript == True:
         - raise on failures (like before)
@@ -84,11 +111,40 @@ def run_cmd(
     info("Running: " + " ".join(cmd) + (f" (cwd={cwd})" if cwd else ""))
 
     try:
-        p = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
             cwd=str(cwd) if cwd else None,
-            capture_output=True  # Always capture, even if stopScript == False
+            stdout=subprocess.PIPE,  # Always capture, even if stopScript == False
+            stderr=subprocess.PIPE,
         )
+        out_tail: deque = deque(maxlen=RUN_CMD_TAIL_LINES)
+        err_tail: deque = deque(maxlen=RUN_CMD_TAIL_LINES)
+        tee = sys.stdout if verbose else None
+        readers = [
+            threading.Thread(target=_drain_pipe, args=(proc.stdout, out_tail, tee), daemon=True),
+            threading.Thread(target=_drain_pipe, args=(proc.stderr, err_tail, tee), daemon=True),
+        ]
+        for t in readers:
+            t.start()
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for t in readers:
+                t.join()
+
+        p = subprocess.CompletedProcess(cmd, returncode, stdout=b"".join(out_tail), stderr=b"".join(err_tail))
+
+    except subprocess.TimeoutExpired:
+        msg = f"Command timed out after {timeout}s: {' '.join(cmd)}"
+        error(msg)
+        if stopScript:
+            fatal(msg)
+
+        p = subprocess.CompletedProcess(cmd, returncode=124, stdout=b"", stderr=msg.encode("utf-8"))
 
     except FileNotFoundError:
         msg = f"Command not found: {cmd[0]} (is it installed and in PATH?)"
@@ -141,11 +197,17 @@ def run_cmd(
 # -------------------------
 # Docker helpers
 # -------------------------
+# `docker version` only round-trips to the daemon; `docker info` collects much more
+DOCKER_HEALTHCHECK_CMD = ["docker", "version", "--format", "{{.Server.Version}}"]
+DOCKER_HEALTHCHECK_TIMEOUT = 10  # seconds
+
+
+@functools.lru_cache(maxsize=1)
 def require_docker_running():
-    """Checks that Docker daemon is accessible."""
+    """Checks that Docker daemon is accessible (once per process)."""
     require_command("docker")
     try:
-        run_cmd(["docker", "info"], check=True)
+        run_cmd(DOCKER_HEALTHCHECK_CMD, check=True, timeout=DOCKER_HEALTHCHECK_TIMEOUT)
     except Exception:
         fatal(
             "Docker is installed but not running or not accessible.\n"
@@ -170,6 +232,11 @@ def docker_mount_path(p: Path) -> str:
 # -------------------------
 # Configurable preflight checks
 # -------------------------
+# Below this many path checks the thread pool costs more than it saves
+PREFLIGHT_POOL_MIN_CHECKS = 4
+PREFLIGHT_MAX_WORKERS = 16
+
+
 def preflight_check(
     *,
     script_dir: Path,
@@ -187,30 +254,58 @@ def preflight_check(
       - script_dir: used only for log context
       - min_python: (major, minor)
       - require_docker: check docker in PATH
-      - check_docker_daemon: run 'docker info'
+      - check_docker_daemon: query the Docker daemon (docker version)
       - required_dirs: list of (path, description)
       - required_files: list of (path, description)
       - optional_files: list of (path, description) => warning if missing
+
+    Path checks and the Docker checks are independent: when there are enough of them
+    they run concurrently on a thread pool; failures are reported in input order.
     """
     info("Performing preflight checks...")
     require_python(*min_python)
 
-    for p, desc in required_dirs:
-        require_dir(p, desc)
+    checks: List[Tuple[Path, str, str]] = (
+        [(p, desc, "dir") for p, desc in required_dirs]
+        + [(p, desc, "file") for p, desc in required_files]
+        + [(p, desc, "optional") for p, desc in optional_files]
+    )
+
+    def _docker_checks() -> None:
+        if require_docker:
+            require_command("docker")
+        if check_docker_daemon:
+            require_docker_running()
+
+    if len(checks) < PREFLIGHT_POOL_MIN_CHECKS:
+        results = [_check_path(*c) for c in checks]
+        _report_path_checks(checks, results)
+        _docker_checks()
+    else:
+        with ThreadPoolExecutor(max_workers=min(PREFLIGHT_MAX_WORKERS, len(checks) + 1)) as ex:
+            docker_fut = ex.submit(_docker_checks)
+            results = list(ex.map(lambda c: _check_path(*c), checks))
+            _report_path_checks(checks, results)
+            docker_fut.result()
 
-    for p, desc in required_files:
-        require_file(p, desc)
+    info("Preflight checks OK.")
 
-    for p, desc in optional_files:
-        if not p.is_file():
-            warn(f"{desc} not found: {p}")
 
-    if require_docker:
-        require_command("docker")
-    if check_docker_daemon:
-        require_docker_running()
+def _check_path(p: Path, desc: str, kind: str) -> Optional[str]:
+    """Single preflight stat: returns the failure message, or None if OK."""
+    if kind == "dir":
+        return None if p.is_dir() else f"{desc} not found: {p}"
+    return None if p.is_file() else f"{desc} not found: {p}"
 
-    info("Preflight checks OK.")
+
+def _report_path_checks(checks: Sequence[Tuple[Path, str, str]], results: Sequence[Optional[str]]) -> None:
+    for (_p, _desc, kind), msg in zip(checks, results):
+        if msg is None:
+            continue
+        if kind == "optional":
+            warn(msg)
+        else:
+            fatal(msg)
 
 
 # -------------------------
@@ -234,16 +329,91 @@ def resolve_template(script_dir: Path, primary: str, fallback: str) -> Path:
 # -------------------------
 # Target discovery helpers
 # -------------------------
-def find_targets_with_subfolders(root: Path, subfolders: Sequence[str] = ("pltf", "cfg")) -> Iterable[Path]:
+# Upper bound for thread pools doing filesystem metadata work (walks, copies, deletes)
+IO_MAX_WORKERS = 32
+
+
+def _scan_dir(
+    path: str,
+    prune: Optional[Callable[[str], bool]],
+    exclude: frozenset,
+) -> Tuple[str, List[str], List[str], List[str]]:
+    """One os.scandir() call: returns (path, dirnames, filenames, subdirs to descend)."""
+    dirnames: List[str] = []
+    filenames: List[str] = []
+    descend: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    filenames.append(entry.name)
+                    continue
+                if (prune is not None and prune(entry.name)) or entry.path in exclude:
+                    continue
+                dirnames.append(entry.name)
+                # like os.walk: list symlinked dirs, but do not follow them
+                if not entry.is_symlink():
+                    descend.append(entry.path)
+    except OSError:
+        pass
+    return path, dirnames, filenames, descend
+
+
+def walk_dirs_parallel(
+    roots: Iterable[Path],
+    prune: Optional[Callable[[str], bool]] = None,
+    max_workers: Optional[int] = None,
+    exclude: Iterable[Path] = (),
+) -> List[Tuple[str, List[str], List[str]]]:
+    """
+    os.walk-like traversal of `roots` where every directory is scanned on a thread pool,
+    so metadata latency (NFS, Docker bind mounts, Windows) overlaps across directories.
+
+    - prune: directory names for which it returns True are neither listed nor descended.
+    - exclude: directory paths (as reached from `roots`) skipped the same way.
+    - Returns (dirpath, dirnames, filenames) tuples sorted by dirpath.
+    """
+    workers = max_workers or min(IO_MAX_WORKERS, os.cpu_count() or 4)
+    excluded = frozenset(str(p) for p in exclude)
+    results: List[Tuple[str, List[str], List[str]]] = []
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending = {ex.submit(_scan_dir, str(r), prune, excluded) for r in roots if Path(r).is_dir()}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                dirpath, dirnames, filenames, descend = fut.result()
+                results.append((dirpath, dirnames, filenames))
+                for sub in descend:
+                    pending.add(ex.submit(_scan_dir, sub, prune, excluded))
+
+    results.sort(key=lambda r: r[0])
+    return results
+
+
+def find_targets_with_subfolders(
+    root: Path,
+    subfolders: Sequence[str] = ("pltf", "cfg"),
+    skip_prefixes: Tuple[str, ...] = ("TEST_",),
+    exclude_dirs: Iterable[str] = (),
+) -> Iterable[Path]:
     """
     Yield directories under `root` that contain at least one of the given subfolders.
+    Directories starting with one of `skip_prefixes` (generated unit-test packages)
+    or named like one of `exclude_dirs` (e.g. "build", ".git") are pruned before descending.
     """
-    for dirpath, dirnames, _ in os.walk(root):
-        dirpath = Path(dirpath)
-        for sub in subfolders:
-            if sub in dirnames and (dirpath / sub).is_dir():
-                yield dirpath
-                break
+    excluded = frozenset(exclude_dirs)
+
+    def prune(name: str) -> bool:
+        return name in excluded or (bool(skip_prefixes) and name.startswith(skip_prefixes))
+
+    for dirpath, dirnames, _ in walk_dirs_parallel([root], prune=prune):
+        if any(sub in dirnames for sub in subfolders):
+            yield Path(dirpath)
 
 
 # -------------------------
@@ -281,19 +451,32 @@ def backup_if_exists(path: Path, suffix: str = ".bak") -> Optional[Path]:
 # -------------------------
 
 def delete_file(file_path: Path):
-    """Delete a single file or symlink."""
-    if not file_path.exists():
+    """Delete a single file or symlink (one unlink call: no exists/is_file pre-checks)."""
+    file_path = Path(file_path)
+    try:
+        file_path.unlink()
+        info(f"File deleted: {file_path}")
+    except FileNotFoundError:
         warn(f"File does not exist: {file_path}")
-        return
+    except Exception as e:
+        if file_path.is_dir() and not file_path.is_symlink():
+            warn(f"Path is not a file: {file_path}")
+        else:
+            warn(f"Error deleting file '{file_path}': {e}")
+
 
+def write_bytes_fd(path: Path, data: bytes) -> None:
+    """
+    Low-level write of pre-encoded bytes (no per-call encode / TextIOWrapper).
+    No O_BINARY: on Windows the CRT keeps translating LF -> CRLF as write_text did.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
     try:
-        if file_path.is_file() or file_path.is_symlink():
-            file_path.unlink()
-            info(f"File deleted: {file_path}")
-        else:
-            warn(f"Path is not a file: {file_path}")
-    except Exception as e:
-        warn(f"Error deleting file '{file_path}': {e}")
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def move_file(src_file: Path, dest_file: Path):
@@ -350,24 +533,25 @@ def delete_folder(folder_path: Path) -> None:
     """
     folder_path = Path(folder_path)
 
-    if not folder_path.exists():
-        warn(f"Folder does not exist: {folder_path}")
-        return
-
+    # EAFP: a missing folder is reported by rmtree itself, no extra stat up front
     try:
         shutil.rmtree(folder_path)
         info(f"Folder deleted: {folder_path}")
+    except FileNotFoundError:
+        warn(f"Folder does not exist: {folder_path}")
     except Exception as e:
         warn(f"Error deleting folder '{folder_path}': {e}")
 
 
-def copy_entire_folder(src_folder: Path, dest_folder: Path, *, overwrite: bool = True) -> None:
+def copy_entire_folder(src_folder: Path, dest_folder: Path, *, overwrite: bool = True, link: bool = False) -> None:
     """
     Copy the entire src_folder directory into dest_folder.
 
     - If src_folder is missing -> warn and return (no exception).
     - If overwrite=True and dest_folder exists -> delete it first.
     - If overwrite=False and dest_folder exists -> warn and return (no exception).
+    - link=True hardlinks the files (copy fallback across filesystems):
+      only for copies the consumer reads, never edits in place.
     """
     src_folder = Path(src_folder)
     dest_folder = Path(dest_folder)
@@ -388,46 +572,126 @@ def copy_entire_folder(src_folder: Path, dest_folder: Path, *, overwrite: bool =
     dest_folder.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        shutil.copytree(src_folder, dest_folder)
+        shutil.copytree(src_folder, dest_folder, copy_function=link_or_copy if link else shutil.copy2)
         info(f"Folder copied: {src_folder} -> {dest_folder}")
     except Exception as e:
         warn(f"Copy failed for '{src_folder}' -> '{dest_folder}': {e}")
 
+
+def move_folder(src_folder: Path, dest_folder: Path) -> None:
+    """
+    Move src_folder to dest_folder: a single rename on the same filesystem
+    (shutil.move falls back to copy + delete across filesystems).
+
+    - If src_folder is missing -> warn and return (no exception).
+    - If dest_folder exists -> it is replaced.
+    """
+    src_folder = Path(src_folder)
+    dest_folder = Path(dest_folder)
+
+    if not src_folder.is_dir():
+        warn(f"Source folder does not exist (or is not a directory): {src_folder}. Nothing to move.")
+        return
+
+    if dest_folder.exists():
+        delete_folder(dest_folder)
+    dest_folder.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        shutil.move(str(src_folder), str(dest_folder))
+        info(f"Folder moved: {src_folder} -> {dest_folder}")
+    except Exception as e:
+        warn(f"Move failed for '{src_folder}' -> '{dest_folder}': {e}")
+
+
+def _for_each_parallel(fn: Callable[[Path], None], items: List[Path]) -> None:
+    """Run fn on every item, on a thread pool when there is more than one."""
+    if len(items) <= 1:
+        for item in items:
+            fn(item)
+        return
+    with ThreadPoolExecutor(max_workers=min(IO_MAX_WORKERS, len(items))) as ex:
+        list(ex.map(fn, items))
+
+
+def _rmtree_warn(path: str) -> None:
+    """shutil.rmtree that reports what it cannot delete and goes on with the rest of the tree."""
+    def _on_error(func, failed_path, exc) -> None:
+        if isinstance(exc, tuple):  # onerror passes sys.exc_info()
+            exc = exc[1]
+        warn(f"Error deleting '{failed_path}': {exc}")
+
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_on_error)
+    else:
+        shutil.rmtree(path, onerror=_on_error)
+
+
 def clear_folder(folder_path: Path):
-    """Delete all contents of folder_path (folder remains)."""
-    if not folder_path.exists():
+    """Delete all contents of folder_path (folder remains). Entries are deleted concurrently."""
+    # scandir: the entry type comes from the directory listing, no stat per entry
+    try:
+        with os.scandir(folder_path) as it:
+            entries = list(it)
+    except FileNotFoundError:
         warn(f"Folder does not exist: {folder_path}")
         return
 
-    for item in folder_path.iterdir():
+    def _delete_one(entry: os.DirEntry) -> None:
         try:
-            if item.is_file() or item.is_symlink():
-                item.unlink()
-            elif item.is_dir():
-                shutil.rmtree(item)
+            if entry.is_dir(follow_symlinks=False):
+                _rmtree_warn(entry.path)
+            else:
+                os.unlink(entry.path)
         except Exception as e:
-            warn(f"Error deleting '{item}': {e}")
+            warn(f"Error deleting '{entry.path}': {e}")
+
+    _for_each_parallel(_delete_one, entries)
 
     info(f"Folder cleared: {folder_path}")
 
-def copy_folder_contents(src_folder: Path, dest_folder: Path):
+def link_or_copy(src: str, dst: str) -> str:
+    """
+    Hardlink src -> dst (no data copied); fall back to shutil.copy2 (sendfile on Linux)
+    when linking is not possible, e.g. across filesystems.
+    An existing dst is replaced, never written through.
+    """
+    try:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def copy_folder_contents(src_folder: Path, dest_folder: Path, *, link: bool = False):
+    """
+    Copy the contents of src_folder into dest_folder (merging existing dirs),
+    one top-level entry per worker thread.
+    link=True hardlinks files instead of copying them: only for sources that are
+    read-only for the consumer, since both paths then share the same data.
+    """
     info(f"Copying from '{src_folder}' to '{dest_folder}'")
     if not src_folder.exists():
         warn(f"Source folder does not exist: '{src_folder}'. Nothing to copy.")
         return
 
     dest_folder.mkdir(parents=True, exist_ok=True)
+    copy_fn = link_or_copy if link else shutil.copy2
 
-    for item in src_folder.iterdir():
+    def _copy_one(item: Path) -> None:
         dest_path = dest_folder / item.name
         try:
             if item.is_dir():
-                shutil.copytree(item, dest_path, dirs_exist_ok=True)
+                shutil.copytree(item, dest_path, dirs_exist_ok=True, copy_function=copy_fn)
             else:
-                shutil.copy2(item, dest_path)
+                copy_fn(str(item), str(dest_path))
         except Exception as e:
             warn(f"Copy failed for '{item}': {e}")
 
+    _for_each_parallel(_copy_one, list(src_folder.iterdir()))
+
 
 # -------------------------
 # Summary helpers
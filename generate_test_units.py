@@ -1,10 +1,21 @@
 import argparse
+import contextlib
+import functools
+import io
+import json
+import os
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional
-from clang.cindex import Index, Cursor, CursorKind, StorageClass, TypeKind
+from typing import Dict, Iterator, List, Set, Tuple, Optional
+from clang.cindex import (
+    Index, Cursor, CursorKind, StorageClass, TypeKind, TranslationUnit,
+    TranslationUnitLoadError, TranslationUnitSaveError,
+)
 
 
+from common_utils import walk_dirs_parallel
 from path_config_loader import load_paths
 
 DOXY_BLOCK_START = "/**"
@@ -199,51 +210,81 @@ def read_text(p: Path) -> str:
 
 def write_text(p: Path, s: str):
     p.parent.mkdir(parents=True, exist_ok=True)
+    # text mode (newline=None): platform line endings, same policy as write_bytes_fd
     p.write_text(s, encoding="utf-8")
 
 
-def _is_in_test_dir(p: Path) -> bool:
-    return any(part.startswith("TEST_") for part in p.parts)
+def _writeln(buf: io.StringIO, s: str = "") -> None:
+    buf.write(s)
+    buf.write("\n")
 
 
 # ---------------------- Discovery limited to ../pltf and ../cfg ----------------------
 
-def list_c_files(roots: List[Path]) -> List[Path]:
-    out: List[Path] = []
-    for r in roots:
-        if r.is_dir():
-            out.extend([p for p in r.rglob("*.c") if p.is_file() and not _is_in_test_dir(p)])
-    return sorted(out)
+def list_sources(roots: List[Path], exclude: Tuple[Path, ...] = ()) -> Tuple[List[Path], List[Path]]:
+    """
+    Singola visita (parallela) di tutte le root: ritorna (headers, c_files) ordinati.
+    Le cartelle TEST_* e quelle in `exclude` (es. out_root, se sta sotto una root)
+    vengono scartate prima di scendere: e' output generato.
+    """
+    headers: List[Path] = []
+    c_files: List[Path] = []
+
+    walk = walk_dirs_parallel(roots, prune=lambda d: d.startswith("TEST_"), exclude=exclude)
+    for dirpath, _dirnames, filenames in walk:
+        for name in filenames:
+            if name.endswith(".c"):
+                c_files.append(Path(dirpath, name))
+            elif name.endswith(".h"):
+                headers.append(Path(dirpath, name))
+
+    return sorted(headers), sorted(c_files)
 
 
 # ---------------------- Clang helpers ----------------------
 
+_NEWLINE_RE = re.compile("\n")
+
+
+@functools.lru_cache(maxsize=64)
+def _load_src(path_str: str) -> Tuple[str, List[int]]:
+    """
+    Sorgente letto una sola volta per file + offset di inizio di ogni riga
+    (una sola scansione dei newline, senza splitlines), cosi' riga/colonna -> offset e' O(1).
+    """
+    src = read_text(Path(path_str))
+    line_starts = [0]
+    line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(src))
+    return src, line_starts
+
+
 def text_from_extent(ext) -> str:
-    src_path = Path(ext.start.file.name)
-    src = read_text(src_path)
-    lines = src.splitlines(keepends=True)
+    src, line_starts = _load_src(ext.start.file.name)
 
     def idx(loc):
-        li = loc.line - 1
-        ci = loc.column - 1
-        return sum(len(lines[i]) for i in range(li)) + ci
+        return line_starts[loc.line - 1] + loc.column - 1
 
     start = idx(ext.start)
     end = idx(ext.end)
     return src[start:end]
 
 
+@functools.lru_cache(maxsize=4096)
+def _format_prototype(ret: str, name: str, params: Tuple[Tuple[str, str], ...], variadic: bool) -> str:
+    parts = [f"{t} {n}" for t, n in params]
+    if variadic:
+        parts.append("...")
+    param_str = ", ".join(parts) if parts else "void"
+    return f"{ret} {name}({param_str});"
+
+
 def function_prototype(fn: Cursor) -> str:
-    ret = fn.result_type.spelling if fn.result_type else "void"
-    params = []
-    for p in fn.get_arguments():
-        t = p.type.spelling
-        name = p.spelling or "param"
-        params.append(f"{t} {name}")
-    if fn.type.kind == TypeKind.FUNCTIONPROTO and fn.type.is_function_variadic():
-        params.append("...")
-    param_str = ", ".join(params) if params else "void"
-    return f"{ret} {fn.spelling}({param_str});"
+    result_type = fn.result_type
+    ret = result_type.spelling if result_type else "void"
+    params = tuple((p.type.spelling, p.spelling or "param") for p in fn.get_arguments())
+    fn_type = fn.type
+    variadic = fn_type.kind == TypeKind.FUNCTIONPROTO and fn_type.is_function_variadic()
+    return _format_prototype(ret, fn.spelling, params, variadic)
 
 
 def collect_tu_globals(tu_cursor: Cursor) -> Dict[str, Cursor]:
@@ -269,45 +310,135 @@ def analyze_function(fn: Cursor, tu_globals: Dict[str, Cursor]):
     used_globals: Set[str] = set()
     used_static: Set[str] = set()
 
-    def walk(n: Cursor):
-        if n.kind == CursorKind.CALL_EXPR:
-            tgt = None
-            for ch in n.get_children():
-                if hasattr(ch, "referenced") and ch.referenced:
+    # enum libclang in locali: evita un lookup di attributo di modulo per nodo
+    CALL_EXPR = CursorKind.CALL_EXPR
+    DECL_REF_EXPR = CursorKind.DECL_REF_EXPR
+    COMPOUND_STMT = CursorKind.COMPOUND_STMT
+    FUNCTION_DECL = CursorKind.FUNCTION_DECL
+    VAR_DECL = CursorKind.VAR_DECL
+    TRANSLATION_UNIT = CursorKind.TRANSLATION_UNIT
+    STATIC = StorageClass.STATIC
+
+    # visita iterativa (walk_preorder) del solo corpo: niente ricorsione Python
+    for body in fn.get_children():
+        if body.kind != COMPOUND_STMT:
+            continue
+        for n in body.walk_preorder():
+            kind = n.kind
+            if kind == CALL_EXPR:
+                tgt = None
+                for ch in n.get_children():
                     tgt = ch.referenced
-                    break
-            if tgt and tgt.kind == CursorKind.FUNCTION_DECL and tgt.spelling:
-                calls.add(tgt.spelling)
-
-        if n.kind == CursorKind.DECL_REF_EXPR and n.referenced:
-            ref = n.referenced
-            is_glob, is_stat = classify_var(ref)
-            if is_glob:
+                    if tgt:
+                        break
+                if tgt and tgt.kind == FUNCTION_DECL and tgt.spelling:
+                    calls.add(tgt.spelling)
+
+            elif kind == DECL_REF_EXPR:
+                # classify_var inline: solo VAR_DECL a livello di TU
+                ref = n.referenced
+                if ref is None or ref.kind != VAR_DECL:
+                    continue
+                parent = ref.semantic_parent
+                if not parent or parent.kind != TRANSLATION_UNIT:
+                    continue
                 usr = ref.get_usr() or f"{ref.spelling}@{ref.location.file}:{ref.location.line}"
                 if usr in tu_globals:
-                    if is_stat:
+                    if ref.storage_class == STATIC:
                         used_static.add(usr)
                     else:
                         used_globals.add(usr)
 
-        for ch in n.get_children():
-            walk(ch)
+    return calls, used_globals, used_static
 
-    for ch in fn.get_children():
-        if ch.kind == CursorKind.COMPOUND_STMT:
-            walk(ch)
 
-    return calls, used_globals, used_static
+ProtoRange = Tuple[int, int, str]  # (start, end, nome funzione) nel testo dell'header
 
 
-def remove_function_proto_from_header(text: str, func_name: str) -> str:
-    pattern = re.compile(
+@functools.lru_cache(maxsize=1024)
+def _proto_regex(func_name: str) -> "re.Pattern[str]":
+    return re.compile(
         r'(^|\n)\s*([A-Za-z_][\w\s\*\(\),\[\]:]+?\s+)?'
         + re.escape(func_name)
         + r'\s*\([^;{]*\)\s*;\s*(?=\n|$)',
         re.DOTALL,
     )
-    return re.sub(pattern, r"\1", text)
+
+
+def collect_header_prototypes(tu, headers: List[Path]) -> Dict[Path, List[ProtoRange]]:
+    """
+    Indicizza UNA volta, dall'AST della TU gia' parsata, gli intervalli dei prototipi
+    di funzione (FUNCTION_DECL non definizioni) presenti in ciascun header.
+    Ogni intervallo include il ';' finale (e le righe intere, se il prototipo le occupa).
+    """
+    out: Dict[Path, List[ProtoRange]] = {h: [] for h in headers}
+    resolved: Dict[str, Optional[Path]] = {}
+
+    for c in tu.cursor.get_children():
+        if c.kind != CursorKind.FUNCTION_DECL or c.is_definition():
+            continue
+        ext = c.extent
+        f = ext.start.file
+        if f is None or ext.end.file is None or ext.end.file.name != f.name:
+            continue
+        if f.name not in resolved:
+            rp = Path(f.name).resolve()
+            resolved[f.name] = rp if rp in out else None
+        h = resolved[f.name]
+        if h is None:
+            continue
+
+        src, line_starts = _load_src(str(h))
+        start = line_starts[ext.start.line - 1] + ext.start.column - 1
+        end = line_starts[ext.end.line - 1] + ext.end.column - 1
+
+        # l'extent di libclang si ferma prima del ';'
+        n = len(src)
+        while end < n and src[end] in " \t":
+            end += 1
+        if end < n and src[end] == ";":
+            end += 1
+
+        # se il prototipo occupa righe intere, rimuove anche indentazione e a-capo
+        line_start = line_starts[ext.start.line - 1]
+        tail = end
+        while tail < n and src[tail] in " \t\r":
+            tail += 1
+        if not src[line_start:start].strip() and (tail >= n or src[tail] == "\n"):
+            start = line_start
+            end = min(tail + 1, n)
+
+        out[h].append((start, end, c.spelling))
+
+    for ranges in out.values():
+        ranges.sort()
+    return out
+
+
+def remove_function_proto_from_header(
+    text: str,
+    func_name: str,
+    ranges: Optional[List[ProtoRange]] = None,
+) -> str:
+    """
+    Rimuove dal testo dell'header i prototipi di func_name.
+    Con `ranges` (da collect_header_prototypes) e' un semplice slicing;
+    senza, ricade sulla regex (compilata una volta per nome).
+    """
+    if ranges is None:
+        return _proto_regex(func_name).sub(r"\1", text)
+
+    parts: List[str] = []
+    pos = 0
+    for start, end, name in ranges:
+        if name != func_name or start < pos:
+            continue
+        parts.append(text[pos:start])
+        pos = end
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
 
 
 def is_const_qualified(t) -> bool:
@@ -396,163 +527,375 @@ def collect_needed_project_headers(tu, start_c_path: Path, project_roots: List[P
     return sorted(needed)
 
 
-# ---------------------- Main ----------------------
+_INCLUDE_RE = re.compile(r'^[ \t]*#[ \t]*include[ \t]*"([^"]+)"', re.MULTILINE)
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("root", help="workspace path (this script folder)")
-    # allow overriding output dir if needed
-    ap.add_argument("--out-root", default=None, help="path to /unitTest (default: sibling of root)")
-    # pass-through extra clang args after '--'
-    args, extra_clang = ap.parse_known_args()
 
-    workspace_root = Path(args.root).resolve()
-    paths = load_paths(__file__)
+def scan_project_includes(start_c_path: Path, include_dirs: List[Path], project_roots: List[Path]) -> List[Path]:
+    """
+    Come collect_needed_project_headers, ma seguendo i #include "..." testuali
+    (senza valutare #if). Usato con --pch: la TU non riporta gli header gia' nel PCH.
+    """
+    project_roots = [r.resolve() for r in project_roots]
+    needed: Set[Path] = set()
+    stack: List[Path] = [start_c_path.resolve()]
 
-    root = Path(args.root).resolve()         # e.g., /workspace
-    parent = root.parent                     # common parent of /workspace, /pltf, /cfg, /unitTest
-    out_root = Path(args.out_root).resolve() if args.out_root else paths.unit_test_root
+    while stack:
+        cur = stack.pop()
+        for name in _INCLUDE_RE.findall(_load_src(str(cur))[0]):
+            for base in (cur.parent, *include_dirs):
+                cand = base / name
+                if cand.is_file():
+                    cand = cand.resolve()
+                    break
+            else:
+                continue
+            if cand in needed or not _is_under_any(cand, project_roots):
+                continue
+            needed.add(cand)
+            stack.append(cand)
 
-    # Scan roots from YAML config instead of assuming ../pltf and ../cfg
-    scan_roots: List[Path] = [paths.sw_cmp_repo_pltf_dir, paths.sw_cmp_repo_cfg_dir]
+    return sorted(needed)
 
-    # Clang args: std + includes from YAML (+ workspace root) + extras
-    clang_args: List[str] = ["-std=c11"]
-    for inc in scan_roots:
-        clang_args.append(f"-I{inc}")
-    clang_args.append(f"-I{workspace_root}")
-    clang_args.extend(extra_clang)
 
-    index = Index.create()
+# ---------------------- Precompiled header ----------------------
 
-    c_files = list_c_files(scan_roots)
+def build_pch(headers: List[Path], clang_args: List[str], work_dir: Path) -> Optional[Path]:
+    """
+    Precompila tutti gli header del progetto in un unico PCH, con lo stesso libclang
+    usato per il parse (TranslationUnit.save), da passare alle TU con -include-pch.
+    Ritorna None (parse normale) se gli header non compilano insieme.
+    """
+    umbrella = work_dir / "all_headers.h"
+    write_text(umbrella, "".join(f'#include "{h}"\n' for h in headers))
+    pch = work_dir / "all_headers.pch"
+    try:
+        tu = Index.create().parse(str(umbrella), args=["-x", "c-header", *clang_args])
+        tu.save(str(pch))
+    except (TranslationUnitLoadError, TranslationUnitSaveError) as e:
+        print(f"[WARN] PCH not built, headers will be parsed per TU: {e}")
+        return None
+    print(f"[OK] Precompiled {len(headers)} headers -> {pch}")
+    return pch
 
-    for c_path in c_files:
-        tu = index.parse(str(c_path), args=clang_args)
-        tu_globals = collect_tu_globals(tu.cursor)
-        local_defines = collect_local_defines(c_path)
 
-        # Compute per-TU needed project headers (direct + transitive across project headers)
-        needed_headers: List[Path] = collect_needed_project_headers(tu, c_path, scan_roots)
+# ---------------------- Incremental fast path ----------------------
 
+# Candidati "definizione di funzione" (sovra-approssima: in dubbio si fa il parse)
+# [\s\*]+ prima del nome: anche "int *foo(void) {" e "uint8_t **baz(void){"; [^;{}]: non attraversa i corpi
+_FUNC_DEF_RE = re.compile(r"^\s*\w[\w\s\*]*[\s\*]+(\w+)\s*\([^;{}]*\)\s*\{", re.MULTILINE)
+_C_STMT_KEYWORDS = frozenset({"if", "for", "while", "switch", "return", "sizeof"})
 
-        for fn in tu.cursor.get_children():
-            if fn.kind != CursorKind.FUNCTION_DECL or not fn.is_definition():
-                continue
-            if Path(str(fn.location.file)).resolve() != c_path:
-                continue
+# numero di definizioni trovate da libclang all'ultimo parse di ogni .c, in out_root
+DEF_COUNTS_FILE = ".testgen_def_counts.json"
 
-            fn_name = fn.spelling
-
-            # TEST PACKAGE under ../unitTest
-            test_pkg_dir = out_root / f"TEST_{fn_name}"
-            src_dir = test_pkg_dir / "src"
-            test_dir = test_pkg_dir / "test"
-
-            src_exists = src_dir.exists()
-            src_empty = (not src_exists) or (not any(src_dir.iterdir()))
-            test_file_path = test_dir / f"test_{fn_name}.c"
-
-            # assicura sempre che la cartella test/ esista
-            test_dir.mkdir(parents=True, exist_ok=True)
-
-            # se src esiste già ed è piena, non rigenerare src
-            # ma crea comunque il file di test se manca
-            if src_exists and not src_empty:
-                if not test_file_path.exists():
-                    test_c = [
-                        f'#include "{fn_name}.h"',
-                        '#include "unity.h"',
-                        "",
-                    ]
-
-                    for h in needed_headers:
-                        test_c.append(f'#include "mock_{h.name}"')
-
-                    test_c += [
-                        "",
-                        "void setUp(void) {}",
-                        "void tearDown(void) {}",
-                        "",
-                        f"void test_{fn_name}(void)",
-                        "{",
-                        '    TEST_IGNORE_MESSAGE("Auto-generated stub test");',
-                        "}",
-                        "",
-                    ]
-
-                    write_text(test_file_path, "\n".join(test_c))
-                    print(f"[OK] Created missing test file for TEST_{fn_name}")
-
-                print(f"[SKIP] TEST_{fn_name} exists and src/ not empty")
-                continue
 
-            # CASE 1 e CASE 2: rigenera src
-            src_dir.mkdir(parents=True, exist_ok=True)
+def load_def_counts(out_root: Path) -> Dict[str, int]:
+    try:
+        with (out_root / DEF_COUNTS_FILE).open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Ignoring unreadable {DEF_COUNTS_FILE}: {e}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_def_counts(out_root: Path, counts: Dict[str, int]) -> None:
+    path = out_root / DEF_COUNTS_FILE
+    try:
+        out_root.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(counts, f, indent=0, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Could not save {path}: {e}")
 
-            _calls, used_glob_usr, used_stat_usr = analyze_function(fn, tu_globals)
-            
 
-            # ================== src/<fn>.h ==================
-            header_lines = [
-                f"#ifndef TEST_{fn_name.upper()}_H",
-                f"#define TEST_{fn_name.upper()}_H",
-                "",
-            ]
+def candidate_function_names(c_path: Path) -> Set[str]:
+    """Nomi candidati (regex) delle funzioni definite in c_path."""
+    return {m.group(1) for m in _FUNC_DEF_RE.finditer(read_text(c_path))} - _C_STMT_KEYWORDS
 
-            fn_text = text_from_extent(fn.extent)
-            proto = function_prototype(fn)
-            used_define_texts = collect_used_defines_in_function(fn_text, local_defines)
 
-            need_stddef = False
-            need_string = False
+def outputs_up_to_date(names: Set[str], out_root: Path, known_defs: Optional[int]) -> bool:
+    """
+    True se ogni funzione candidata (names, vedi candidate_function_names) ha gia'
+    TEST_<fn>/src non vuota e test/test_<fn>.c: in quel caso il parse libclang non
+    produrrebbe nulla.
+    Conservativa: il numero di candidati deve coincidere con le definizioni che
+    libclang ha trovato all'ultimo parse (known_defs), altrimenti si fa il parse.
+    """
+    if known_defs is None:
+        return False
+    if not names or len(names) != known_defs:
+        return False
 
-            for usr in sorted(used_stat_usr):
-                v = tu_globals[usr]
+    for name in names:
+        if not (out_root / f"TEST_{name}" / "test" / f"test_{name}.c").is_file():
+            return False
+        if src_needs_regen(out_root, name):
+            return False
+    return True
+
+
+def src_needs_regen(out_root: Path, fn_name: str) -> bool:
+    """TEST_<fn>/src mancante o vuota: va rigenerata (serve il corpo della funzione)."""
+    src_dir = out_root / f"TEST_{fn_name}" / "src"
+    return not src_dir.is_dir() or not any(src_dir.iterdir())
+
+
+# ---------------------- Per-file worker ----------------------
+
+def stub_test_source(fn_name: str, mock_include_block: str) -> str:
+    """Contenuto di test/test_<fn>.c generato quando il test non esiste."""
+    return (
+        f'#include "{fn_name}.h"\n'
+        '#include "unity.h"\n'
+        "\n"
+        f"{mock_include_block}"
+        "\n"
+        "void setUp(void) {}\n"
+        "void tearDown(void) {}\n"
+        "\n"
+        f"void test_{fn_name}(void)\n"
+        "{\n"
+        '    TEST_IGNORE_MESSAGE("Auto-generated stub test");\n'
+        "}\n"
+    )
 
-                # copia solo static dichiarati nel file .c
-                if Path(str(v.location.file)).resolve() != c_path:
-                    continue
 
-                t = v.type
-                if is_array_type(t):
-                    need_stddef = True
-                    if not is_const_qualified(t) and array_count_or_none(t) is not None:
-                        need_string = True
-
-            # --- include solo gli header necessari (diretti + transitivi) ---
-            for h in needed_headers:
-                header_lines.append(f'#include "{h.name}"')
-            header_lines.append("")
-
-            # --- include standard necessari ---
-            if need_stddef:
-                header_lines.append("#include <stddef.h>")
-            if need_string:
-                header_lines.append("#include <string.h>")
-            if need_stddef or need_string:
-                header_lines.append("")
-
-            # --- define locali usate dalla funzione ---
-            if used_define_texts:
-                for d in used_define_texts:
-                    header_lines.append(d)
-                header_lines.append("")
-
-            # --- commento DOXYGEN (prima del prototipo) ---
-            doxy = get_doxygen_comment_for_function(fn)
-            if doxy:
-                header_lines.append(doxy)
-
-            # --- prototipo funzione (solo UNA volta) ---
-            header_lines.append(proto)
-            header_lines.append("")
-
-            # --- accessor per variabili statiche ---
+_INDEX: Optional[Index] = None
+
+
+def _get_index() -> Index:
+    """Index libclang per processo (non e' picklable: creato lazy nel worker)."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = Index.create()
+    return _INDEX
+
+
+def _parse_args(clang_args: List[str], pch: Optional[Path]) -> List[str]:
+    return clang_args + ["-include-pch", str(pch)] if pch else clang_args
+
+
+def _file_definitions(tu: TranslationUnit, c_path: Path) -> List[Cursor]:
+    """Definizioni di funzione che stanno proprio in c_path (non negli header inclusi)."""
+    return [
+        fn for fn in tu.cursor.get_children()
+        if fn.kind == CursorKind.FUNCTION_DECL and fn.is_definition()
+        and Path(str(fn.location.file)).resolve() == c_path
+    ]
+
+
+def process_c_file(
+    c_path: Path,
+    clang_args: List[str],
+    out_root: Path,
+    scan_roots: List[Path],
+    pch: Optional[Path] = None,
+    skip_names: frozenset = frozenset(),
+) -> Tuple[List[str], List[str]]:
+    """
+    Genera i pacchetti TEST_<fn> per tutte le funzioni definite in c_path.
+    Ritorna le righe di log, stampate dal processo padre, e i nomi delle funzioni
+    definite trovati da libclang. Il fast path (file gia' generato) e' in _process_all.
+    Con `pch`, gli header del progetto arrivano dal PCH invece di essere riparsati.
+    Le funzioni in `skip_names` sono assegnate a un file precedente (vedi _process_all).
+    """
+    log: List[str] = []
+
+    parse_args = _parse_args(clang_args, pch)
+    index = _get_index()
+
+    # 1) parse senza corpi delle funzioni: bastano per globali, include e definizioni presenti
+    tu = index.parse(str(c_path), args=parse_args, options=TranslationUnit.PARSE_SKIP_FUNCTION_BODIES)
+
+    def_names = {fn.spelling for fn in _file_definitions(tu, c_path)}
+
+    # 2) parse completo solo se almeno una funzione del file deve rigenerare src/
+    if any(src_needs_regen(out_root, name) for name in def_names):
+        tu = index.parse(str(c_path), args=parse_args)
+
+    tu_globals = collect_tu_globals(tu.cursor)
+    local_defines = collect_local_defines(c_path)
+
+    # Compute per-TU needed project headers (direct + transitive across project headers)
+    needed_headers: List[Path]
+    if pch:
+        include_dirs = [Path(a[2:]) for a in clang_args if a.startswith("-I")]
+        needed_headers = scan_project_includes(c_path, include_dirs, scan_roots)
+    else:
+        needed_headers = collect_needed_project_headers(tu, c_path, scan_roots)
+    header_protos = collect_header_prototypes(tu, needed_headers)
+
+    # blocchi #include identici per tutte le funzioni della TU: costruiti una volta
+    include_block = "".join(f'#include "{h.name}"\n' for h in needed_headers)
+    mock_include_block = "".join(f'#include "mock_{h.name}"\n' for h in needed_headers)
+
+    # funzioni dichiarate in ciascun header + cache degli header da non modificare
+    proto_names: Dict[Path, Set[str]] = {h: {name for _s, _e, name in r} for h, r in header_protos.items()}
+    plain_headers: Dict[Path, str] = {}
+
+    for fn in tu.cursor.get_children():
+        if fn.kind != CursorKind.FUNCTION_DECL or not fn.is_definition():
+            continue
+        if Path(str(fn.location.file)).resolve() != c_path:
+            continue
+
+        fn_name = fn.spelling
+        if fn_name in skip_names:
+            log.append(f"[SKIP] TEST_{fn_name} is generated from an earlier file")
+            continue
+
+        # TEST PACKAGE under ../unitTest
+        test_pkg_dir = out_root / f"TEST_{fn_name}"
+        src_dir = test_pkg_dir / "src"
+        test_dir = test_pkg_dir / "test"
+
+        src_exists = src_dir.exists()
+        src_empty = (not src_exists) or (not any(src_dir.iterdir()))
+        test_file_path = test_dir / f"test_{fn_name}.c"
+
+        # assicura sempre che la cartella test/ esista
+        test_dir.mkdir(parents=True, exist_ok=True)
+
+        # se src esiste già ed è piena, non rigenerare src
+        # ma crea comunque il file di test se manca
+        if src_exists and not src_empty:
+            if not test_file_path.exists():
+                write_text(test_file_path, stub_test_source(fn_name, mock_include_block))
+                log.append(f"[OK] Created missing test file for TEST_{fn_name}")
+
+            log.append(f"[SKIP] TEST_{fn_name} exists and src/ not empty")
+            continue
+
+        # CASE 1 e CASE 2: rigenera src
+        src_dir.mkdir(parents=True, exist_ok=True)
+
+        _calls, used_glob_usr, used_stat_usr = analyze_function(fn, tu_globals)
+
+
+        # ================== src/<fn>.h ==================
+        hdr = io.StringIO()
+        _writeln(hdr, f"#ifndef TEST_{fn_name.upper()}_H")
+        _writeln(hdr, f"#define TEST_{fn_name.upper()}_H")
+        _writeln(hdr)
+
+        fn_text = text_from_extent(fn.extent)
+        proto = function_prototype(fn)
+        used_define_texts = collect_used_defines_in_function(fn_text, local_defines)
+
+        need_stddef = False
+        need_string = False
+
+        for usr in sorted(used_stat_usr):
+            v = tu_globals[usr]
+
+            # copia solo static dichiarati nel file .c
+            if Path(str(v.location.file)).resolve() != c_path:
+                continue
+
+            t = v.type
+            if is_array_type(t):
+                need_stddef = True
+                if not is_const_qualified(t) and array_count_or_none(t) is not None:
+                    need_string = True
+
+        # --- include solo gli header necessari (diretti + transitivi) ---
+        hdr.write(include_block)
+        _writeln(hdr)
+
+        # --- include standard necessari ---
+        if need_stddef:
+            _writeln(hdr, "#include <stddef.h>")
+        if need_string:
+            _writeln(hdr, "#include <string.h>")
+        if need_stddef or need_string:
+            _writeln(hdr)
+
+        # --- define locali usate dalla funzione ---
+        if used_define_texts:
+            for d in used_define_texts:
+                _writeln(hdr, d)
+            _writeln(hdr)
+
+        # --- commento DOXYGEN (prima del prototipo) ---
+        doxy = get_doxygen_comment_for_function(fn)
+        if doxy:
+            _writeln(hdr, doxy)
+
+        # --- prototipo funzione (solo UNA volta) ---
+        _writeln(hdr, proto)
+        _writeln(hdr)
+
+        # --- accessor per variabili statiche ---
+        for usr in sorted(used_stat_usr):
+            v = tu_globals[usr]
+            t = v.type
+            vname = v.spelling
+            v_is_const = is_const_qualified(t)
+            v_is_array = is_array_type(t)
+
+            if v_is_array:
+                elem_t = array_elem_type_spelling(t)
+                cnt = array_count_or_none(t)
+
+                _writeln(
+                    hdr,
+                    f"{'const ' if v_is_const else ''}{elem_t}* get_{vname}_ptr(void);"
+                )
+                _writeln(hdr, f"size_t get_{vname}_size(void);")
+
+                if (not v_is_const) and (cnt is not None):
+                    _writeln(hdr, f"void set_{vname}(const {elem_t}* src, size_t n);")
+
+            else:
+                tname = t.spelling
+                _writeln(hdr, f"{tname} get_{vname}(void);")
+                if not v_is_const:
+                    _writeln(hdr, f"void set_{vname}({tname} val);")
+
+        _writeln(hdr)
+        _writeln(hdr, f"#endif /* TEST_{fn_name.upper()}_H */")
+
+        clean_h = strip_function_keywords_in_header(hdr.getvalue())
+        write_text(src_dir / f"{fn_name}.h", clean_h)
+
+        # ================== src/<fn>_help.h ==================
+        hlp = io.StringIO()
+        _writeln(hlp, f"#ifndef TEST_{fn_name.upper()}_HELP_H")
+        _writeln(hlp, f"#define TEST_{fn_name.upper()}_HELP_H")
+        _writeln(hlp)
+        _writeln(hlp, f'#include "{fn_name}.h"')
+        _writeln(hlp, "#include <stddef.h>")
+        _writeln(hlp, "#include <string.h>")
+        _writeln(hlp)
+
+        # Dichiara solo le globali non statiche usate dalla funzione
+        if used_glob_usr:
+            _writeln(hlp, "/* non-static globals used by this function */")
+            for usr in sorted(used_glob_usr):
+                v = tu_globals[usr]
+                orig = text_from_extent(v.extent).strip()
+                orig = re.sub(r"^\s*extern\s+", "", orig)
+                if not orig.endswith(";"):
+                    orig += ";"
+                _writeln(hlp, orig)
+            _writeln(hlp)
+
+        if used_stat_usr:
+            _writeln(hlp, "/* static globals (copied) */")
             for usr in sorted(used_stat_usr):
                 v = tu_globals[usr]
                 t = v.type
                 vname = v.spelling
+                static_src = text_from_extent(v.extent).strip()
+                if not static_src.endswith(";"):
+                    static_src += ";"
+                _writeln(hlp, static_src)
+
                 v_is_const = is_const_qualified(t)
                 v_is_array = is_array_type(t)
 
@@ -560,145 +903,179 @@ def main():
                     elem_t = array_elem_type_spelling(t)
                     cnt = array_count_or_none(t)
 
-                    header_lines.append(
-                        f"{'const ' if v_is_const else ''}{elem_t}* get_{vname}_ptr(void);"
+                    _writeln(
+                        hlp,
+                        f"{'const ' if v_is_const else ''}{elem_t}* get_{vname}_ptr(void) {{ return {vname}; }}"
                     )
-                    header_lines.append(f"size_t get_{vname}_size(void);")
+
+                    if cnt is not None:
+                        _writeln(
+                            hlp,
+                            f"size_t get_{vname}_size(void) {{ return (size_t){cnt}; }}"
+                        )
+                    else:
+                        _writeln(hlp, f"size_t get_{vname}_size(void) {{ return 0; }}")
 
                     if (not v_is_const) and (cnt is not None):
-                        header_lines.append(f"void set_{vname}(const {elem_t}* src, size_t n);")
+                        _writeln(
+                            hlp,
+                            f"void set_{vname}(const {elem_t}* src, size_t n) {{\n"
+                            f"    size_t m = (n < (size_t){cnt}) ? n : (size_t){cnt};\n"
+                            f"    memcpy({vname}, src, m * sizeof({elem_t}));\n"
+                            f"}}"
+                        )
 
                 else:
                     tname = t.spelling
-                    header_lines.append(f"{tname} get_{vname}(void);")
+                    _writeln(hlp, f"{tname} get_{vname}(void) {{ return {vname}; }}")
                     if not v_is_const:
-                        header_lines.append(f"void set_{vname}({tname} val);")
-
-            header_lines.append("")
-            header_lines.append(f"#endif /* TEST_{fn_name.upper()}_H */\n")
-
-            clean_h = strip_function_keywords_in_header("\n".join(header_lines))
-            write_text(src_dir / f"{fn_name}.h", clean_h)
-
-            # ================== src/<fn>_help.h ==================
-            help_lines = [
-                f"#ifndef TEST_{fn_name.upper()}_HELP_H",
-                f"#define TEST_{fn_name.upper()}_HELP_H",
-                "",
-                f'#include "{fn_name}.h"',
-                "#include <stddef.h>",
-                "#include <string.h>",
-                "",
-            ]
-
-            # Dichiara solo le globali non statiche usate dalla funzione
-            if used_glob_usr:
-                help_lines.append("/* non-static globals used by this function */")
-                for usr in sorted(used_glob_usr):
-                    v = tu_globals[usr]
-                    orig = text_from_extent(v.extent).strip()
-                    orig = re.sub(r"^\s*extern\s+", "", orig)
-                    if not orig.endswith(";"):
-                        orig += ";"
-                    help_lines.append(orig)
-                help_lines.append("")
-
-            if used_stat_usr:
-                help_lines.append("/* static globals (copied) */")
-                for usr in sorted(used_stat_usr):
-                    v = tu_globals[usr]
-                    t = v.type
-                    vname = v.spelling
-                    static_src = text_from_extent(v.extent).strip()
-                    if not static_src.endswith(";"):
-                        static_src += ";"
-                    help_lines.append(static_src)
-
-                    v_is_const = is_const_qualified(t)
-                    v_is_array = is_array_type(t)
-
-                    if v_is_array:
-                        elem_t = array_elem_type_spelling(t)
-                        cnt = array_count_or_none(t)
-
-                        help_lines.append(
-                            f"{'const ' if v_is_const else ''}{elem_t}* get_{vname}_ptr(void) {{ return {vname}; }}"
-                        )
+                        _writeln(hlp, f"void set_{vname}({tname} val) {{ {vname} = val; }}")
 
-                        if cnt is not None:
-                            help_lines.append(
-                                f"size_t get_{vname}_size(void) {{ return (size_t){cnt}; }}"
-                            )
-                        else:
-                            help_lines.append("size_t get_{vname}_size(void) { return 0; }")
-
-                        if (not v_is_const) and (cnt is not None):
-                            help_lines.append(
-                                f"void set_{vname}(const {elem_t}* src, size_t n) {{\n"
-                                f"    size_t m = (n < (size_t){cnt}) ? n : (size_t){cnt};\n"
-                                f"    memcpy({vname}, src, m * sizeof({elem_t}));\n"
-                                f"}}"
-                            )
+            _writeln(hlp)
 
-                    else:
-                        tname = t.spelling
-                        help_lines.append(f"{tname} get_{vname}(void) {{ return {vname}; }}")
-                        if not v_is_const:
-                            help_lines.append(f"void set_{vname}({tname} val) {{ {vname} = val; }}")
+        _writeln(hlp, f"#endif /* TEST_{fn_name.upper()}_HELP_H */")
 
-                help_lines.append("")
+        clean_help = strip_function_keywords_in_header(hlp.getvalue())
+        write_text(src_dir / f"{fn_name}_help.h", clean_help)
 
-            help_lines.append(f"#endif /* TEST_{fn_name.upper()}_HELP_H */\n")
+        # ================== src/<fn>.c ==================
+        impl = f'#include "{fn_name}_help.h"\n\n/* FUNCTION TO TEST */\n{fn_text}'
+        clean_c = strip_function_keywords_in_header(impl)
+        write_text(src_dir / f"{fn_name}.c", clean_c)
 
-            clean_help = strip_function_keywords_in_header("\n".join(help_lines))
-            write_text(src_dir / f"{fn_name}_help.h", clean_help)
 
-            # ================== src/<fn>.c ==================
-            impl = [
-                f'#include "{fn_name}_help.h"',
-                "",
-                "/* FUNCTION TO TEST */",
-                fn_text,
-            ]
+        # ================== copy cleaned headers (needed project headers only) ==================
+        for h in needed_headers:
+            text = _load_src(str(h))[0]
+            if fn_name in proto_names[h]:
+                cleaned = remove_function_proto_from_header(text, fn_name, header_protos[h])
+                cleaned = strip_function_keywords_in_header(cleaned)
+            elif _proto_regex(fn_name).search(text):
+                # prototipo senza intervallo nell'AST (es. dentro una macro): regex
+                cleaned = remove_function_proto_from_header(text, fn_name, None)
+                cleaned = strip_function_keywords_in_header(cleaned)
+            else:
+                # l'header non dichiara fn: stessa versione pulita per tutte le funzioni
+                cleaned = plain_headers.get(h)
+                if cleaned is None:
+                    cleaned = strip_function_keywords_in_header(text)
+                    plain_headers[h] = cleaned
+            write_text(src_dir / h.name, cleaned)
 
-            clean_c = strip_function_keywords_in_header("\n".join(impl))
-            write_text(src_dir / f"{fn_name}.c", clean_c)
 
 
-            # ================== copy cleaned headers (needed project headers only) ==================
-            for h in needed_headers:
-                cleaned = remove_function_proto_from_header(read_text(h), fn_name)
-                cleaned = strip_function_keywords_in_header(cleaned)
-                write_text(src_dir / h.name, cleaned)
+        # ================== create test/<fn>.c only if test didn't exist ==================
+        if not test_file_path.exists():
+            write_text(test_file_path, stub_test_source(fn_name, mock_include_block))
 
+        log.append(f"[OK] Generated TEST_{fn_name} (src regenerated) -> {test_pkg_dir}")
 
+    return log, sorted(def_names)
+
+
+def _process_all(
+    c_files: List[Path],
+    clang_args: List[str],
+    out_root: Path,
+    scan_roots: List[Path],
+    force: bool,
+    pch: Optional[Path],
+    jobs: int,
+) -> Iterator[List[str]]:
+    """
+    process_c_file su tutti i .c: in sequenza con jobs == 1, altrimenti su un process pool.
+    Il fast path (regex, una lettura per file) gira qui: i file gia' generati non
+    arrivano ai worker. Aggiorna DEF_COUNTS_FILE con le definizioni dei parse fatti.
+    """
+    def_counts = load_def_counts(out_root)
+    candidates: Dict[Path, Set[str]] = {}
+    to_parse: List[Path] = []
+    for c_path in c_files:
+        names = candidate_function_names(c_path)
+        if force or not outputs_up_to_date(names, out_root, def_counts.get(str(c_path))):
+            candidates[c_path] = names
+            to_parse.append(c_path)
+
+    jobs = jobs or os.cpu_count() or 1
+    parallel = jobs > 1 and len(to_parse) > 1
+    with contextlib.ExitStack() as stack:
+        if not parallel:
+            results = (process_c_file(c_path, clang_args, out_root, scan_roots, pch) for c_path in to_parse)
+            skip_sets: List[frozenset] = [frozenset()] * len(to_parse)
+        else:
+            # stesso nome (es. static) candidato in piu' file: TEST_<fn> lo scrive solo
+            # il primo file nell'ordine di c_files, come nel caso sequenziale.
+            # Solo i candidati gia' calcolati dal fast path: nessun parse in piu'
+            claimed: Set[str] = set()
+            skip_sets = []
+            for c_path in to_parse:
+                skip_sets.append(frozenset(claimed & candidates[c_path]))
+                claimed |= candidates[c_path]
+
+            n = len(to_parse)
+            ex = stack.enter_context(ProcessPoolExecutor(max_workers=min(jobs, n)))
+            results = ex.map(
+                process_c_file, to_parse, [clang_args] * n, [out_root] * n, [scan_roots] * n, [pch] * n, skip_sets
+            )
+
+        parsed = iter(zip(skip_sets, results))
+        generated: Set[str] = set()   # definizioni (libclang) dei file gia' processati
+        for c_path in c_files:
+            if c_path not in candidates:
+                yield [f"[SKIP] {c_path.name}: all TEST_* packages exist (use --force to re-parse)"]
+                continue
+            skip_names, (log, def_names) = next(parsed)
+            def_counts[str(c_path)] = len(def_names)
+            # in parallelo le assegnazioni vengono dalla regex, non da libclang:
+            # segnala quelle sbagliate invece di tacerle
+            for name in sorted(skip_names - generated) if parallel else ():
+                log.append(f"[WARN] TEST_{name} skipped in {c_path.name} but no earlier file defines it: rerun with --jobs 1")
+            for name in sorted((generated & set(def_names)) - skip_names) if parallel else ():
+                log.append(f"[WARN] TEST_{name} defined in more than one file, written concurrently: rerun with --jobs 1")
+            generated.update(def_names)
+            yield log
+    save_def_counts(out_root, def_counts)
+
+
+# ---------------------- Main ----------------------
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("root", help="workspace path (this script folder)")
+    # allow overriding output dir if needed
+    ap.add_argument("--out-root", default=None, help="path to /unitTest (default: sibling of root)")
+    ap.add_argument("--jobs", type=int, default=0, help="parallel worker processes (default: CPU count, 1 = sequential)")
+    ap.add_argument("--force", action="store_true", help="always parse every .c file (disable the up-to-date fast path)")
+    ap.add_argument("--pch", action="store_true", help="precompile all project headers once and reuse them for every TU")
+    # pass-through extra clang args after '--'
+    args, extra_clang = ap.parse_known_args()
+
+    workspace_root = Path(args.root).resolve()
+    paths = load_paths(__file__)
+
+    root = Path(args.root).resolve()         # e.g., /workspace
+    parent = root.parent                     # common parent of /workspace, /pltf, /cfg, /unitTest
+    out_root = Path(args.out_root).resolve() if args.out_root else paths.unit_test_root
+
+    # Scan roots from YAML config instead of assuming ../pltf and ../cfg
+    scan_roots: List[Path] = [paths.sw_cmp_repo_pltf_dir, paths.sw_cmp_repo_cfg_dir]
+
+    # Clang args: std + includes from YAML (+ workspace root) + extras
+    clang_args: List[str] = ["-std=c11"]
+    for inc in scan_roots:
+        clang_args.append(f"-I{inc}")
+    clang_args.append(f"-I{workspace_root}")
+    clang_args.extend(extra_clang)
+
+    headers, c_files = list_sources(scan_roots, exclude=(out_root,))
+
+    pch_dir = tempfile.TemporaryDirectory(prefix="testgen_pch_") if args.pch else contextlib.nullcontext()
+    with pch_dir as tmp:
+        pch = build_pch(headers, clang_args, Path(tmp)) if tmp and headers and c_files else None
+        for log in _process_all(c_files, clang_args, out_root, scan_roots, args.force, pch, args.jobs):
+            for line in log:
+                print(line)
 
-            # ================== create test/<fn>.c only if test didn't exist ==================
-            if not test_file_path.exists():
-                test_c = [
-                    f'#include "{fn_name}.h"',
-                    '#include "unity.h"',
-                    "",
-                ]
-
-                for h in needed_headers:
-                    test_c.append(f'#include "mock_{h.name}"')
-
-                test_c += [
-                    "",
-                    "void setUp(void) {}",
-                    "void tearDown(void) {}",
-                    "",
-                    f"void test_{fn_name}(void)",
-                    "{",
-                    '    TEST_IGNORE_MESSAGE("Auto-generated stub test");',
-                    "}",
-                    "",
-                ]
-
-                write_text(test_file_path, "\n".join(test_c))
-
-            print(f"[OK] Generated TEST_{fn_name} (src regenerated) -> {test_pkg_dir}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
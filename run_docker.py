@@ -5,45 +5,99 @@ import platform
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
 IMG_TAG_DEFAULT = "llvm-c-parser:latest"
 WORKDIR_IN_CONTAINER = "/workspace"
+OUTDIR_IN_CONTAINER = "/out"
+DOCKER_HEALTHCHECK_TIMEOUT = 10  # seconds
 
 
-def sh(cmd: list[str], check=True, capture_output=False, text=True):
-    return subprocess.run(cmd, check=check, capture_output=capture_output, text=text)
+def sh(cmd: list[str], check=True, capture_output=False, text=True, env=None):
+    return subprocess.run(cmd, check=check, capture_output=capture_output, text=text, env=env)
 
 
-def docker_available():
+def docker_available(timeout: float = DOCKER_HEALTHCHECK_TIMEOUT) -> bool:
+    # only the server version: one daemon round-trip, minimal output
     try:
-        sh(["docker", "version"], check=True, capture_output=True)
-        return True
+        p = subprocess.run(
+            ["docker", "version", "--format", "{{.Server.Version}}"],
+            capture_output=True,
+            timeout=timeout,
+        )
+        return p.returncode == 0
     except Exception:
         return False
 
 
-def build_image(tag: str, context: str = ".", dockerfile: Optional[str] = None):
-    cmd = ["docker", "build", "-t", tag]
+def build_image(
+    tag: str,
+    context: str = ".",
+    dockerfile: Optional[str] = None,
+    cache_from: Sequence[str] = (),
+    cache_to: Optional[str] = None,
+):
+    """
+    BuildKit build: the RUN --mount=type=cache steps of the Dockerfile keep
+    apt state between builds, cache_from/cache_to (e.g.
+    "type=registry,ref=<img>:cache" or "type=gha") keep the layers between
+    CI runs. cache_to needs buildx, plain `docker build` can only import.
+    """
+    env = {**os.environ, "DOCKER_BUILDKIT": "1"}
+    if cache_to:
+        # --load: the image must end up in the local daemon for docker_run
+        cmd = ["docker", "buildx", "build", "--load", "--cache-to", cache_to]
+    else:
+        # inline cache metadata so the pushed image itself can serve as --cache-from
+        cmd = ["docker", "build", "--build-arg", "BUILDKIT_INLINE_CACHE=1"]
+    cmd += ["-t", tag]
+    for src in cache_from:
+        cmd += ["--cache-from", src]
     if dockerfile:
         cmd += ["-f", dockerfile]
     cmd.append(context)
     print(f"[BUILD] {' '.join(cmd)}")
-    sh(cmd)
-
-
-def docker_run(tag: str, cmd: str, host_dir: str, interactive: bool = False):
+    sh(cmd, env=env)
+
+
+def bind_mount(source: str, target: str, read_only: bool = False, cached: bool = True) -> list[str]:
+    if not cached:
+        return ["-v", f"{source}:{target}" + (":ro" if read_only else "")]
+    # consistency=cached: fewer host<->VM round-trips on Docker Desktop (ignored on Linux)
+    spec = f"type=bind,source={source},target={target},consistency=cached"
+    if read_only:
+        spec += ",readonly"
+    return ["--mount", spec]
+
+
+def docker_run(
+    tag: str,
+    cmd: str,
+    host_dir: str,
+    interactive: bool = False,
+    *,
+    read_only: bool = False,
+    cached: bool = True,
+    extra_mounts: Sequence[tuple[str, str]] = (),
+):
+    """
+    extra_mounts: (host_path, container_path) pairs mounted read-write,
+    e.g. an output folder next to a read-only workspace.
+    """
     args = [
         "docker", "run", "--rm",
         "-w", WORKDIR_IN_CONTAINER,
-        "-v", f"{host_dir}:{WORKDIR_IN_CONTAINER}"
+        *bind_mount(host_dir, WORKDIR_IN_CONTAINER, read_only=read_only, cached=cached),
     ]
+    for src, dst in extra_mounts:
+        args += bind_mount(src, dst, cached=cached)
 
     # Only add -it when interactive=True
     if interactive:
         args.append("-it")
 
-    args += [tag, "bash", "-lc", cmd]
+    # non-login shell: cmd is a shell string, but /etc/profile & co. need not be sourced
+    args += [tag, "bash", "-c", cmd]
 
     print(f"[RUN] {' '.join(args)}")
     sh(args)
@@ -61,6 +115,8 @@ def main():
     p_testgen.add_argument("--tag", default=IMG_TAG_DEFAULT)
     p_testgen.add_argument("--host-dir", default=str(Path.cwd()))
     p_testgen.add_argument("--script", default="generate_test_units.py")
+    p_testgen.add_argument("--out-dir", default=None,
+                           help="cartella host per i TEST_* (montata rw su /out, workspace in sola lettura)")
     p_testgen.add_argument("clang_args", nargs=argparse.REMAINDER)
 
     # build
@@ -68,6 +124,10 @@ def main():
     p_build.add_argument("--tag", default=IMG_TAG_DEFAULT)
     p_build.add_argument("--context", default=".")
     p_build.add_argument("--file", help="Dockerfile path/name", default=None)
+    p_build.add_argument("--cache-from", action="append", default=[],
+                         help="cache source, e.g. type=registry,ref=<img>:cache (repeatable)")
+    p_build.add_argument("--cache-to", default=None,
+                         help="cache export, e.g. type=registry,mode=max,ref=<img>:cache or type=gha (uses buildx)")
 
     # bash interactive
     p_bash = sub.add_parser("bash")
@@ -113,7 +173,8 @@ def main():
     # ACTIONS
     #
     if args.action == "build":
-        build_image(args.tag, args.context, args.file)
+        build_image(args.tag, args.context, args.file,
+                    cache_from=args.cache_from, cache_to=args.cache_to)
         return
 
     if args.action == "bash":
@@ -144,14 +205,14 @@ def main():
         incs = " ".join(f'-I"{p}"' for p in args.includes)
         defs = " ".join(f'-D{d}' for d in args.defines)
         cmd = f'clang -std={args.std} {incs} {defs} -Xclang -ast-dump -fsyntax-only "{args.file}"'
-        docker_run(args.tag, cmd, args.host_dir, interactive=False)
+        docker_run(args.tag, cmd, args.host_dir, interactive=False, read_only=True)
         return
 
     if args.action == "libclang-ast":
         incs = " ".join(f'-I"{p}"' for p in args.includes)
         defs = " ".join(f'-D{d}' for d in args.defines)
         cmd = f'python3 "{args.script}" "{args.file}" -- -std={args.std} {incs} {defs}'
-        docker_run(args.tag, cmd, args.host_dir, interactive=False)
+        docker_run(args.tag, cmd, args.host_dir, interactive=False, read_only=True)
         return
 
     if args.action == "testgen":
@@ -160,6 +221,17 @@ def main():
             clang_args = clang_args[1:]
 
         clang_str = " ".join(clang_args)
+
+        if args.out_dir:
+            # workspace read-only, output on a separate rw mount
+            cmd = f'python3 "{args.script}" "{args.root}" --out-root {OUTDIR_IN_CONTAINER} -- {clang_str}'
+            out_dir = Path(args.out_dir).resolve()
+            # --mount type=bind does not create a missing source, unlike -v
+            out_dir.mkdir(parents=True, exist_ok=True)
+            docker_run(args.tag, cmd, args.host_dir, interactive=False,
+                       read_only=True, extra_mounts=[(str(out_dir), OUTDIR_IN_CONTAINER)])
+            return
+
         cmd = f'python3 "{args.script}" "{args.root}" -- {clang_str}'
 
         # FIX: NON‑INTERACTIVE IN CI
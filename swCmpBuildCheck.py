@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import getpass
 from datetime import datetime
-import xml.etree.ElementTree as ET
+try:
+    # C-implemented tree walking and tag-filtered iterparse
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
 import html
+import os
 import re
 from pathlib import Path
-from typing import Union, Dict
+from typing import Union, Dict, Iterator, List, Optional, TextIO, Tuple
 import sys
 import subprocess
 import shutil
+import tempfile
 
 from common_utils import (
     info, warn, error, fatal,
@@ -18,11 +28,14 @@ from common_utils import (
     require_docker_running,
     run_cmd,
     find_targets_with_subfolders,
+    walk_dirs_parallel,
+    link_or_copy,
     preflight_check,
     copy_entire_folder,
     delete_folder,
     delete_file,
-    move_file
+    move_file,
+    write_bytes_fd,
 
 )
 from path_config_loader import load_paths
@@ -33,15 +46,23 @@ PATHS = load_paths(__file__)
 MISRA_RULES_PATH = PATHS.sw_cmp_misra_rules_path
 
 
+@functools.lru_cache(maxsize=256)
+def resolved(path: Union[str, Path]) -> Path:
+    """Path(path).resolve() once per distinct path: the same PATHS entries reach several helpers."""
+    return Path(path).resolve()
+
+
 def copy_into_workspace(src_dir: Path, workspace: Path, name: str) -> Path:
     """
     Copy folder `src_dir` into `workspace/name`.
     - Skips if source doesn't exist.
     - Overwrites destination if it exists.
+    - Files are hardlinked when src and workspace share a filesystem
+      (copied otherwise): treat the copy as read-only.
     Returns destination path.
     """
-    src_dir = Path(src_dir).resolve()
-    workspace = Path(workspace).resolve()
+    src_dir = resolved(src_dir)
+    workspace = resolved(workspace)
     dst_dir = (workspace / name).resolve()
 
     if not src_dir.is_dir():
@@ -54,10 +75,16 @@ def copy_into_workspace(src_dir: Path, workspace: Path, name: str) -> Path:
     except ValueError:
         raise ValueError(f"Destination escapes workspace: {dst_dir}")
 
-    if dst_dir.exists():
-        shutil.rmtree(dst_dir)
-
-    shutil.copytree(src_dir, dst_dir)
+    # Stage the new tree next to dst, then swap it in with O(1) renames
+    staging = Path(tempfile.mkdtemp(prefix=f".{name}.", dir=workspace))
+    try:
+        staged = staging / name
+        shutil.copytree(src_dir, staged, copy_function=link_or_copy)
+        if dst_dir.exists():
+            os.replace(dst_dir, staging / f"{name}.old")
+        os.replace(staged, dst_dir)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
     return dst_dir
 
 
@@ -87,22 +114,80 @@ def preflight_checks(script_dir: Path) -> None:
 # ----------------------------------------------------
 # Existing logic (cleaned paths)
 # ----------------------------------------------------
+# Static parts of the HTML report, built once at import
+REPORT_TITLE = "Cppcheck MISRA Results"
+REPORT_CSS = """
+table {
+    border-collapse: collapse;
+    width: 100%;
+    font-family: Arial, sans-serif;
+    font-size: 14px;
+}
+th, td {
+    border: 1px solid #ccc;
+    padding: 4px 8px;
+}
+th {
+    background-color: #f2f2f2;
+}
+tbody tr:hover td {
+    background-color: #e8f2ff;
+}
+.meta {
+    margin: 6px 0 10px 0;
+}
+"""
+REPORT_HTML_START = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<title>{REPORT_TITLE}</title>
+<style>{REPORT_CSS}</style>
+</head>
+<body>
+<h1>{REPORT_TITLE}</h1>
+<p class="meta"><strong>"""
+REPORT_HTML_END = """</tbody>
+</table>
+</body>
+</html>
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def report_tester_html() -> str:
+    """Escaped user name for the report meta line: same for every report of the process."""
+    return html.escape(getpass.getuser())
+
+
 def load_misra_rules(misra_rules_path: Union[str, Path]) -> Dict[str, str]:
-    rules: Dict[str, str] = {}
-    path = Path(misra_rules_path).resolve()
+    """
+    Rule id -> severity. The parsed table is cached per (path, mtime):
+    the returned dict is shared, treat it as read-only.
+    """
+    path = resolved(misra_rules_path)
 
     if not path.is_file():
         warn(f"MISRA rules file not found: {path}. cppcheck severities will be used instead.")
-        return rules
+        return {}
+
+    return _load_misra_rules_cached(str(path), path.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_misra_rules_cached(path_str: str, mtime_ns: int) -> Dict[str, str]:
+    rules: Dict[str, str] = {}
+    path = Path(path_str)
 
     with path.open("r", encoding="utf-8", errors="replace") as f:
         for line in f:
             line = line.strip()
-            if not line or not line.startswith("Rule "):
+            if not line.startswith("Rule "):
                 continue
 
             rest = line[5:].strip()
-            parts = rest.split("\t")
+            # only the first two fields are used: do not split the rest of the line
+            parts = rest.split("\t", 2)
             if len(parts) < 2:
                 parts = rest.split(None, 1)
                 if len(parts) < 2:
@@ -112,199 +197,389 @@ def load_misra_rules(misra_rules_path: Union[str, Path]) -> Dict[str, str]:
             severity = parts[1].strip()
 
             if rule_id:
-                rules[rule_id] = severity
+                # a handful of distinct severities: one shared (hash-cached) object each
+                rules[rule_id] = sys.intern(severity)
 
     info(f"Loaded {len(rules)} MISRA rules from {path}")
     return rules
 
 
+MISRA_ID_PREFIX = "misra-c2012-"
 MISRA_ID_REGEX = re.compile(r"misra-c2012-(\d+\.\d+)")
 
+# octal escapes cppcheck leaves in msg/info text (tab, UTF-8 ellipsis)
+CPPCHECK_TEXT_FIXUPS = {"\\011": " ", "\\342\\200\\246": "…"}
+CPPCHECK_TEXT_FIXUP_REGEX = re.compile("|".join(map(re.escape, CPPCHECK_TEXT_FIXUPS)))
 
+# HTML report layout
+REPORT_SKIP_ATTRS = frozenset(("cwe", "file0", "verbose"))
+REPORT_PREFERRED_ORDER = ("id", "severity", "file1", "msg")
+HTML_WRITE_BUFFER = 1024 * 1024
 
+# row colour by severity; checked in this order when the severity is not a bare keyword
+SEVERITY_ROW_STYLES = {
+    "advisory": ' style="background-color: #ffff99;"',
+    "required": ' style="background-color: #ffcc80;"',
+    "mandatory": ' style="background-color: #ff9999;"',
+}
 
-def generate_html_for_cppcheck_xml(xml_path: Union[str, Path], misra_rules_path: Union[str, Path]) -> str:
-    xml_path = Path(xml_path).resolve()
-    xml_dir = xml_path.parent
+# report discovery
+CPPCHECK_XML_NAMES = ("cppcheck_misra_results.mxl", "cppcheck_misra_results.xml")
+REPORT_SCAN_PRUNE = frozenset(("build", ".git"))
+COMPONENT_SCAN_EXCLUDE = frozenset(("build", ".git", "node_modules"))
 
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
 
-    errors = root.findall(".//error")
-    if not errors:
-        info(f"No <error> elements found in {xml_path}")
-        return ""
+def clean_cppcheck_text(text: str) -> str:
+    if "\\" not in text:
+        return text
+    # one scan for all sequences instead of one str.replace pass each
+    return CPPCHECK_TEXT_FIXUP_REGEX.sub(_cppcheck_fixup, text)
 
-    misra_rules = load_misra_rules(misra_rules_path)
 
-    attr_names = set()
-    for err in errors:
-        attr_names.update(err.attrib.keys())
+def _cppcheck_fixup(m: re.Match) -> str:
+    return CPPCHECK_TEXT_FIXUPS[m.group()]
 
-    attr_names.discard("cwe")
-    attr_names.discard("file0")
-    attr_names.discard("verbose")
 
-    preferred_order = ["id", "severity", "file1", "msg"]
-    ordered_attrs = [a for a in preferred_order if a in attr_names]
-    ordered_attrs.extend(sorted(attr_names - set(ordered_attrs)))
-    columns = ordered_attrs + ["locations"]
+def misra_severity(err_id: str, misra_rules: Dict[str, str]) -> str:
+    """MISRA severity for a cppcheck id ("" when not a known MISRA rule)."""
+    # canonical "misra-c2012-X.Y": plain slice + dict hit, no regex engine
+    if err_id.startswith(MISRA_ID_PREFIX):
+        severity = misra_rules.get(err_id[len(MISRA_ID_PREFIX):])
+        if severity is not None:
+            return severity
+    m = MISRA_ID_REGEX.search(err_id)
+    return misra_rules.get(m.group(1), "") if m else ""
 
-    rows_html = []
 
-    for err in errors:
-        cells = []
+def escape_cppcheck_text(text: str, _escape=html.escape) -> str:
+    """Cleaned + HTML-escaped value; missing attributes ("") skip both calls."""
+    if not text:
+        return ""
+    return _escape(clean_cppcheck_text(text))
 
-        err_id = err.attrib.get("id", "")
-        severity_val = ""
 
-        m = MISRA_ID_REGEX.search(err_id)
-        if m:
-            rule_number = m.group(1)
-            severity_val = misra_rules.get(rule_number, "")
+def severity_row_style(severity: str) -> str:
+    """Row style attribute for a severity (exact keyword first, then 'contains')."""
+    sev_norm = severity.strip().lower()
+    style = SEVERITY_ROW_STYLES.get(sev_norm)
+    if style is not None:
+        return style
+    for word, style in SEVERITY_ROW_STYLES.items():
+        if word in sev_norm:
+            return style
+    return ""
 
-        if not severity_val:
-            severity_val = err.attrib.get("severity", "")
 
-        severity_for_row = severity_val or ""
-        sev_norm = severity_for_row.strip().lower()
+ErrorRecord = Tuple[Dict[str, str], List[Dict[str, str]]]
 
-        row_style = ""
-        if "advisory" in sev_norm:
-            row_style = ' style="background-color: #ffff99;"'
-        elif "required" in sev_norm:
-            row_style = ' style="background-color: #ffcc80;"'
-        elif "mandatory" in sev_norm:
-            row_style = ' style="background-color: #ff9999;"'
 
-        for col in ordered_attrs:
-            val = severity_for_row if col == "severity" else err.attrib.get(col, "")
-            cells.append("<td>%s</td>" % html.escape(val))
+def iter_cppcheck_errors(xml_path: Path) -> Iterator[ErrorRecord]:
+    """
+    Stream the <error> elements of a cppcheck XML report as plain
+    (attrib, [location attrib, ...]) records.
+    Each element is cleared and detached from its parent once converted,
+    so memory stays O(one error) instead of O(whole report).
+    """
+    if HAVE_LXML:
+        for _, elem in ET.iterparse(str(xml_path), events=("end",), tag="error"):
+            # iterchildren(tag): C-level child filter, no path expression to evaluate
+            yield dict(elem.attrib), [dict(loc.attrib) for loc in elem.iterchildren("location")]
+            elem.clear()
+            # drop the already processed siblings still referenced by the parent
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        return
+
+    parents: list[ET.Element] = []
+    for event, elem in ET.iterparse(str(xml_path), events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag == "error":
+            yield dict(elem.attrib), [dict(loc.attrib) for loc in elem.findall("location")]
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+
+def write_report_rows(
+    out: TextIO,
+    errors: List[ErrorRecord],
+    ordered_attrs: List[str],
+    misra_rules: Dict[str, str],
+) -> None:
+    """
+    Write one <tr>...</tr> per error, in the column order of the header, straight
+    into `out` (the buffered report file, or an io.StringIO): no per-row strings.
+    """
+    # hot loop: bind the lookups once
+    _write = out.write
+    _esc = escape_cppcheck_text
+    # the "severity" column shows the resolved severity: split the columns around it
+    # once instead of testing every column of every row
+    has_severity_col = "severity" in ordered_attrs
+    if has_severity_col:
+        i = ordered_attrs.index("severity")
+        cols_before_severity, cols_after_severity = ordered_attrs[:i], ordered_attrs[i + 1:]
+    else:
+        cols_before_severity, cols_after_severity = ordered_attrs, []
+
+    # severity -> row style, filled lazily: a plain dict probe per row
+    row_style_by_severity: Dict[str, str] = {}
+    # the same ids repeat thousands of times: resolve each distinct one once
+    misra_severity_by_id: Dict[str, str] = {}
+
+    for err_attrib, err_locations in errors:
+        err_id = err_attrib.get("id", "")
+        severity_val = misra_severity_by_id.get(err_id)
+        if severity_val is None:
+            severity_val = misra_severity_by_id[err_id] = misra_severity(err_id, misra_rules)
 
-        locations_html = []
-        for loc in err.findall("location"):
-            file_ = loc.attrib.get("file", "")
-            line = loc.attrib.get("line", "")
-            col_ = loc.attrib.get("column", "")
-            info_txt = loc.attrib.get("info", "")
+        if not severity_val:
+            severity_val = err_attrib.get("severity", "")
 
-            # Build "file:line:column" (omit missing parts)
-            parts = []
-            if file_:
-                parts.append(file_)
-            if line:
-                parts.append(line)
-            if col_:
-                parts.append(col_)
+        severity_for_row = severity_val or ""
+        row_style = row_style_by_severity.get(severity_for_row)
+        if row_style is None:
+            row_style = row_style_by_severity[severity_for_row] = severity_row_style(severity_for_row)
+
+        _write("<tr")
+        _write(row_style)
+        _write(">")
+        _get = err_attrib.get
+        for col in cols_before_severity:
+            _write("<td>")
+            _write(_esc(_get(col, "")))
+            _write("</td>")
+        if has_severity_col:
+            _write("<td>")
+            _write(_esc(severity_for_row))
+            _write("</td>")
+        for col in cols_after_severity:
+            _write("<td>")
+            _write(_esc(_get(col, "")))
+            _write("</td>")
+
+        _write("<td>")
+        sep = ""
+        for loc in err_locations:
+            file_ = loc.get("file", "")
+            line = loc.get("line", "")
+            col_ = loc.get("column", "")
+            info_txt = loc.get("info", "")
+
+            # Build "file:line:column" (omit missing parts); common case in one f-string
+            if file_ and line and col_:
+                pos_text = f"{file_}:{line}:{col_}"
+            else:
+                pos_text = ":".join([p for p in (file_, line, col_) if p])
+
+            # Escape everything for HTML safety (the " - " separator needs no escaping)
+            _write(sep)
+            _write(_esc(pos_text))
+            if info_txt:
+                _write(" - ")
+                _write(_esc(info_txt))
+            sep = "<br>"
+        _write("</td></tr>")
+
+
+def generate_html_for_cppcheck_xml(
+    xml_path: Union[str, Path],
+    misra_rules_path: Union[str, Path],
+    misra_rules: Optional[Dict[str, str]] = None,
+    force: bool = False,
+) -> str:
+    """
+    misra_rules: table already loaded by the caller (skips load_misra_rules).
+    An HTML report newer than its XML is kept as is unless force=True.
+    """
+    xml_path = Path(xml_path).resolve()
+    html_path = xml_path.with_suffix(".html")
 
-            pos_text = ":".join(parts) if parts else ""
-            info_text = f" - {info_txt}" if info_txt else ""
+    if not force and is_up_to_date(html_path, xml_path):
+        info(f"Up-to-date, skipping: {html_path}")
+        _delete_source_xml(xml_path)
+        return str(html_path)
 
-            # Escape everything for HTML safety
-            locations_html.append(f"{html.escape(pos_text)}{html.escape(info_text)}")
+    # Single pass: buffer the error records (the ET nodes are freed while streaming)
+    # and collect the column names on the way
+    errors: list[ErrorRecord] = []
+    attr_names = set()
+    for record in iter_cppcheck_errors(xml_path):
+        attr_names.update(record[0])
+        errors.append(record)
+    if not errors:
+        info(f"No <error> elements found in {xml_path}")
+        return ""
 
+    if misra_rules is None:
+        misra_rules = load_misra_rules(misra_rules_path)
 
-        loc_html = "<br>".join(locations_html)
-        cells.append("<td>%s</td>" % loc_html)
+    attr_names -= REPORT_SKIP_ATTRS
 
-        rows_html.append("<tr%s>%s</tr>" % (row_style, "".join(cells)))
+    ordered_attrs = [a for a in REPORT_PREFERRED_ORDER if a in attr_names]
+    ordered_attrs.extend(sorted(attr_names - set(ordered_attrs)))
+    columns = ordered_attrs + ["locations"]
 
     header_cells = "".join("<th>%s</th>" % html.escape(col) for col in columns)
     header_html = "<tr>%s</tr>" % header_cells
 
-    css = """
-table {
-    border-collapse: collapse;
-    width: 100%;
-    font-family: Arial, sans-serif;
-    font-size: 14px;
-}
-th, td {
-    border: 1px solid #ccc;
-    padding: 4px 8px;
-}
-th {
-    background-color: #f2f2f2;
-}
-tbody tr:hover td {
-    background-color: #e8f2ff;
-}
-.meta {
-    margin: 6px 0 10px 0;
-}
-"""
-
-    title = "Cppcheck MISRA Results"
-    tester = getpass.getuser()
     now = datetime.now()
-    meta_line = f"Tester: {html.escape(tester)}&nbsp;&nbsp;Date: {now:%d/%m/%y}&nbsp;&nbsp;Time: {now:%H:%M:%S}"
-
-    html_doc = f"""<!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8">
-<title>{title}</title>
-<style>{css}</style>
-</head>
-<body>
-<h1>{title}</h1>
-<p class="meta"><strong>{meta_line}</strong></p>
-<p>Source file: <code>{html.escape(str(xml_path))}</code></p>
-<table>
-<thead>{header_html}</thead>
-<tbody>{''.join(rows_html)}</tbody>
-</table>
-</body>
-</html>
-"""
-
-    html_path = xml_path.with_suffix(".html")
-    html_path.write_text(html_doc, encoding="utf-8")
-
-    cleaned = html_path.read_text(encoding="utf-8").replace("\\011", " ").replace("\\342\\200\\246", "…")
-    html_path.write_text(cleaned, encoding="utf-8")
+    meta_line = f"Tester: {report_tester_html()}&nbsp;&nbsp;Date: {now:%d/%m/%y}&nbsp;&nbsp;Time: {now:%H:%M:%S}"
+
+    html_head = "".join((
+        REPORT_HTML_START,
+        meta_line,
+        "</strong></p>\n<p>Source file: <code>",
+        html.escape(str(xml_path)),
+        "</code></p>\n<table>\n<thead>",
+        header_html,
+        "</thead>\n<tbody>",
+    ))
+
+    # cppcheck escapes already cleaned per value: single write, no read-back pass.
+    # Rows are rendered while being written (no list of all rows) through a large buffer.
+    # Written next to the target and renamed over it: a crash never leaves a truncated
+    # report, and the XML is deleted only once the complete HTML is in place
+    tmp_path = html_path.with_name(html_path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=HTML_WRITE_BUFFER) as fh:
+            fh.write(html_head)
+            write_report_rows(fh, errors, ordered_attrs, misra_rules)
+            fh.write(REPORT_HTML_END)
+        os.replace(tmp_path, html_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
     info(f"Generated: {html_path}")
+    _delete_source_xml(xml_path)
+    return str(html_path)
+
 
+def _delete_source_xml(xml_path: Path) -> None:
     try:
-        xml_path.unlink()
+        xml_path.unlink(missing_ok=True)
         info(f"Deleted source XML: {xml_path}")
     except Exception as e:
         warn(f"Could not delete {xml_path}: {e}")
 
-    return str(html_path)
 
+def is_up_to_date(output: Path, source: Path) -> bool:
+    """
+    True if `output` exists and is strictly newer than `source`: on coarse
+    timestamp filesystems a source rewritten in the same tick is rebuilt.
+    """
+    try:
+        return output.stat().st_mtime_ns > source.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def find_cppcheck_xml_reports(root: Path) -> list[Path]:
+    """cppcheck XML results under `root`; build/ and .git/ are pruned, never descended."""
+    found: list[Path] = []
+    for dirpath, _, filenames in walk_dirs_parallel([root], prune=REPORT_SCAN_PRUNE.__contains__):
+        for name in CPPCHECK_XML_NAMES:
+            if name in filenames:
+                xml_path = Path(dirpath) / name
+                if xml_path.is_file():
+                    found.append(xml_path)
+    return found
+
+
+# MISRA table of a report worker process, set by _init_report_worker
+_WORKER_RULES: Dict[str, str] = {}
+
+
+def _init_report_worker(misra_rules: Dict[str, str]) -> None:
+    global _WORKER_RULES
+    _WORKER_RULES = misra_rules
+
+
+def _report_worker(xml_path: Path, misra_rules_path: Union[str, Path], force: bool) -> str:
+    return generate_html_for_cppcheck_xml(xml_path, misra_rules_path, _WORKER_RULES, force)
+
+
+def generate_cppcheck_html_reports(
+    root_folder: Union[str, Path],
+    misra_rules_path: Union[str, Path],
+    force: bool = False,
+) -> None:
+    """
+    One report per XML: independent and CPU-bound, so fanned out on a process pool.
+    force=True regenerates reports that are newer than their XML too.
+    """
+    root = resolved(root_folder)
+    xml_paths = find_cppcheck_xml_reports(root)
+    if not xml_paths:
+        return
+    misra_rules = load_misra_rules(misra_rules_path)
 
-def generate_cppcheck_html_reports(root_folder: Union[str, Path], misra_rules_path: Union[str, Path]) -> None:
-    root = Path(root_folder).resolve()
-    for xml_path in root.rglob("*"):
-        if xml_path.is_file() and xml_path.name in ("cppcheck_misra_results.mxl", "cppcheck_misra_results.xml"):
+    if len(xml_paths) == 1:
+        try:
+            generate_html_for_cppcheck_xml(xml_paths[0], misra_rules_path, misra_rules, force)
+        except Exception as e:
+            error(f"Failed to process {xml_paths[0]}: {e}")
+        return
+
+    workers = min(os.cpu_count() or 1, len(xml_paths))
+    # the rules table is shipped once per worker, not pickled into every task
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_report_worker, initargs=(misra_rules,)
+    ) as ex:
+        futures = {
+            ex.submit(_report_worker, xml_path, misra_rules_path, force): xml_path
+            for xml_path in xml_paths
+        }
+        for fut, xml_path in futures.items():
             try:
-                generate_html_for_cppcheck_xml(xml_path, misra_rules_path)
+                fut.result()
             except Exception as e:
                 error(f"Failed to process {xml_path}: {e}")
 
 
+def file_has_bytes(path: Path, data: bytes) -> bool:
+    """True if `path` already holds exactly `data` (size check first, read only on a size match)."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
 def scan_components(codebase_root: Path, template_content: str) -> list[Path]:
-    codebase_root = Path(codebase_root).resolve()
+    codebase_root = resolved(codebase_root)
     info(f"Scanning for components under: {codebase_root}")
     created: list[Path] = []
 
-    for target_dir in find_targets_with_subfolders(codebase_root, ("pltf", "cfg")):
-        target_dir = Path(target_dir)
-
-        # ✅ Skip anything inside build directories
-        if "build" in target_dir.parts:
-            continue
+    # encode the template once, split around every placeholder
+    template_parts = template_content.encode("utf-8").split(b"projectName")
+    # bytes as they land on disk (write_bytes_fd keeps the platform newline translation)
+    disk_newline = os.linesep.encode("ascii")
 
+    # COMPONENT_SCAN_EXCLUDE dirs (build/, .git/, ...) are pruned during the walk, never descended
+    for target_dir in find_targets_with_subfolders(
+        codebase_root, ("pltf", "cfg"), exclude_dirs=COMPONENT_SCAN_EXCLUDE
+    ):
         cmake_path = target_dir / "CMakeLists.txt"
 
         project_name = target_dir.name
-        component_content = template_content.replace("projectName", project_name)
+        component_bytes = project_name.encode("utf-8").join(template_parts)
+
+        # unchanged content: no write, so the mtime stays and CMake does not reconfigure
+        on_disk = component_bytes if disk_newline == b"\n" else component_bytes.replace(b"\n", disk_newline)
+        if file_has_bytes(cmake_path, on_disk):
+            info(f"CMakeLists.txt up to date in: {target_dir}")
+            created.append(cmake_path)
+            continue
 
         info(f"Creating CMakeLists.txt in: {target_dir} (projectName -> {project_name})")
         try:
-            cmake_path.write_text(component_content, encoding="utf-8")
+            write_bytes_fd(cmake_path, component_bytes)
         except Exception as e:
             error(f"Failed to write {cmake_path}: {e}")
             continue
@@ -316,13 +591,22 @@ def scan_components(codebase_root: Path, template_content: str) -> list[Path]:
         sys.exit(0)
 
     info("CMakeLists.txt created in:")
-    for p in created:
-        print(f" - {p}")
+    # one write for the whole list instead of one print per component
+    sys.stdout.write("".join(f" - {p}\n" for p in created))
+    sys.stdout.flush()
     return created
 
 
+def run_concurrently(*calls: tuple) -> None:
+    """Run (fn, *args) calls on a thread pool; re-raises the first failure after all finished."""
+    with ThreadPoolExecutor(max_workers=len(calls)) as ex:
+        futures = [ex.submit(fn, *args) for fn, *args in calls]
+    for fut in futures:
+        fut.result()
+
+
 def build_and_run_docker(script_dir: Path) -> None:
-    script_dir = Path(script_dir).resolve()
+    script_dir = resolved(script_dir)
     info("Building Docker image: cmake-misra-multi")
     run_cmd(["docker", "build", "-t", "cmake-misra-multi", "."], cwd=script_dir, check=True)
 
@@ -333,8 +617,8 @@ def build_and_run_docker(script_dir: Path) -> None:
             "docker", "run", "--rm",
             "-v", f"{cwd}:/workspace",
             "cmake-misra-multi",
-            "bash", "-lc",
-            "build-and-check-all.sh"
+            # exec form: the script (shebang, on PATH) is PID 1, no login shell to source
+            "build-and-check-all.sh",
         ],
         check=True,
     )
@@ -360,13 +644,17 @@ def main():
     template_path = PATHS.sw_cmp_template_path
     template_content = template_path.read_text(encoding="utf-8", errors="replace")
 
-    # Copy cfg/pltf from repo root into workspace (script_dir)
-    delete_folder(PATHS.sw_cmp_workspace_build_dir)
-    delete_folder(PATHS.sw_cmp_repo_build_dir)
-    delete_file(PATHS.sw_cmp_workspace_report_file)
-    delete_file(PATHS.sw_cmp_repo_report_file)
-    copy_entire_folder(PATHS.sw_cmp_repo_cfg_dir, PATHS.sw_cmp_workspace_cfg_dir, overwrite=True)
-    copy_entire_folder(PATHS.sw_cmp_repo_pltf_dir, PATHS.sw_cmp_workspace_pltf_dir, overwrite=True)
+    # Clean old outputs and copy cfg/pltf from repo root into workspace (script_dir).
+    # All targets are distinct paths: run the I/O-bound steps concurrently.
+    run_concurrently(
+        (delete_folder, PATHS.sw_cmp_workspace_build_dir),
+        (delete_folder, PATHS.sw_cmp_repo_build_dir),
+        (delete_file, PATHS.sw_cmp_workspace_report_file),
+        (delete_file, PATHS.sw_cmp_repo_report_file),
+        # cfg/pltf are only read by the analysis container: hardlink instead of copying bytes
+        (functools.partial(copy_entire_folder, link=True), PATHS.sw_cmp_repo_cfg_dir, PATHS.sw_cmp_workspace_cfg_dir),
+        (functools.partial(copy_entire_folder, link=True), PATHS.sw_cmp_repo_pltf_dir, PATHS.sw_cmp_workspace_pltf_dir),
+    )
     created: list[Path] = []
     try:
         created = scan_components(repo_root, template_content)
@@ -377,16 +665,14 @@ def main():
     # Generate HTML reports from XMLs under repo_root
     generate_reports(repo_root, MISRA_RULES_PATH)
 
-
-    move_file(PATHS.sw_cmp_workspace_report_file, PATHS.sw_cmp_repo_report_file)
-
-    # Copy build back to repo root (if it exists)
-
-    copy_entire_folder(PATHS.sw_cmp_workspace_build_dir, PATHS.sw_cmp_repo_build_dir, overwrite=True)
-
-    # Cleanup temporary cfg/pltf in workspace
-    delete_folder(PATHS.sw_cmp_workspace_cfg_dir)
-    delete_folder(PATHS.sw_cmp_workspace_pltf_dir)
+    # Move the report, copy build back to repo root (if it exists)
+    # and cleanup temporary cfg/pltf in workspace: independent paths again
+    run_concurrently(
+        (move_file, PATHS.sw_cmp_workspace_report_file, PATHS.sw_cmp_repo_report_file),
+        (copy_entire_folder, PATHS.sw_cmp_workspace_build_dir, PATHS.sw_cmp_repo_build_dir),
+        (delete_folder, PATHS.sw_cmp_workspace_cfg_dir),
+        (delete_folder, PATHS.sw_cmp_workspace_pltf_dir),
+    )
     info("Done.")
 
 
@@ -1,16 +1,31 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import atexit
+import csv
+import hashlib
+import io
+import json
+import mmap
 import os
 import re
 import sys
 import shutil
 import subprocess
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from html.parser import HTMLParser
 from pathlib import Path
-from datetime import datetime
 from typing import Optional
 
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
 from common_utils import (
     info, warn, error, fatal,
     require_python, require_command, require_dir,
@@ -19,7 +34,10 @@ from common_utils import (
     preflight_check,
     clear_folder,
     copy_entire_folder,
-    copy_folder_contents
+    copy_folder_contents,
+    link_or_copy,
+    move_folder,
+    write_bytes_fd,
 )
 
 from path_config_loader import load_paths
@@ -36,21 +54,62 @@ UNIT_EXECUTION_FOLDER_TEST = PATHS.unit_execution_folder_test
 UNIT_EXECUTION_FOLDER_BUILD = PATHS.unit_execution_folder_build
 UNIT_RESULT_FOLDER = PATHS.unit_result_folder
 RESULT_REPORT = "total_result_report.txt"
+RESULT_HEADER = ("function_name", "test_name", "status", "linesCvrg", "branchesCvrg")
+# per-file identifier index reused by build_modules across runs
+FUNCTION_INDEX_FILE = PATHS.script_dir / ".cache" / "funcs.json"
+FUNCTION_INDEX_VERSION = 1
+# per-unit input digest + rows of the last run, next to a hardlinked copy of its results
+UNIT_CACHE_FOLDER = PATHS.script_dir / ".cache" / "units"
+UNIT_CACHE_VERSION = 1
 
 DOCKER_MOUNT = docker_mount_path(PATHS.docker_mount_source)
+CEEDLING_IMAGE = "throwtheswitch/madsciencelab-plugins:1.0.1b"
+CONTAINER_PROJECT_DIR = "/home/dev/project"
+
+
+def docker_base(mount: str) -> list[str]:
+    return [
+        "docker",
+        "run",
+        "-i",  # no -t: output is captured through pipes, a PTY is only overhead
+        "--rm",
+        "-v",
+        f"{mount}:{CONTAINER_PROJECT_DIR}",
+        CEEDLING_IMAGE,
+    ]
+
+
+DOCKER_BASE = docker_base(DOCKER_MOUNT)
 
-DOCKER_BASE = [
-    "docker",
-    "run",
-    "-it",
-    "--rm",
-    "-v",
-    f"{DOCKER_MOUNT}:/home/dev/project",
-    "throwtheswitch/madsciencelab-plugins:1.0.1b",
-]
+# no clobber: the build folder lives in the execution folder, cleared before every unit
+CEEDLING_GCOV_ALL = ["ceedling", "gcov:all"]
 
-CEEDLING_CLEAN = ["ceedling", "clobber"]
-DOCKER_CLEAN = DOCKER_BASE + CEEDLING_CLEAN
+# Regex compilate una sola volta a livello di modulo
+# trova setUp, tearDown e le funzioni void test_XXX(void) oppure void testXXX(void)
+UNITY_FUNC_RE = re.compile(
+    rb'\bvoid\s+(setUp|tearDown|test_[A-Za-z0-9_]*|test[A-Za-z0-9_]*)\s*\(\s*void\s*\)\s*{',
+    re.MULTILINE
+)
+ATTRIBUTE_RE = re.compile(r'__attribute__\s*\(\([^)]*\)\)\s*')
+QUALIFIER_RE = re.compile(
+    r'\b(static|inline|INLINE|extern|constexpr|volatile|register|__inline__|__forceinline)\b'
+)
+# identificatori seguiti da "(" sulla stessa riga: stessa regola di _definitions_pattern
+IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+IDENTIFIER_CALL_RE = re.compile(rb'\b([A-Za-z_][A-Za-z0-9_]*)(?=[^\S\n]*\([^)\n]*\))')
+FUNCTION_HEADER_TEMPLATE = r"""
+    (?P<header>
+        ^[ \t]*
+        (?P<before>[^\n]*?)
+        \b{function_name}\b
+        \s*
+        (?P<params>\([^)]*\))
+        (?P<post_attr>
+            (?:\s*__attribute__\s*\(\([^)]*\)\))*
+        )
+    )
+    \s*\{{
+"""
 
 
 def preflight_checks(project_root: Path):
@@ -72,15 +131,43 @@ class TestResultRow:
     branchesCvrg: str
 
 
-    def to_csv_line(self) -> str:
+    def fields(self) -> tuple[str, str, str, str, str]:
+        """Cells in RESULT_HEADER order."""
         return (
-            f"{self.module_function_name},"
-            f"{self.test_name},"
-            f"{self.status},"
-            f"{self.linesCvrg},"
-            f"{self.branchesCvrg},"
+            self.module_function_name,
+            self.test_name,
+            self.status,
+            self.linesCvrg,
+            self.branchesCvrg,
         )
 
+@dataclass(frozen=True)
+class ExecutionWorkspace:
+    """Ceedling project mounted in the container and its utUnderTest folders."""
+    mount_source: Path
+    execution_folder: Path
+    test_folder: Path
+    build_folder: Path
+    container: Optional[str] = None  # long-lived container, see start_container
+
+    @property
+    def docker_base(self) -> list[str]:
+        if self.container:
+            return ["docker", "exec", self.container]
+        return docker_base(docker_mount_path(self.mount_source))
+
+
+DEFAULT_WORKSPACE = ExecutionWorkspace(
+    PATHS.docker_mount_source,
+    UNIT_EXECUTION_FOLDER,
+    UNIT_EXECUTION_FOLDER_TEST,
+    UNIT_EXECUTION_FOLDER_BUILD,
+)
+# parallel runs: one private Ceedling project per worker process, removed with the execution folder
+WORKERS_FOLDER = UNIT_EXECUTION_FOLDER / ".workers"
+CEEDLING_PROJECT_FILES = ("project.yml", "mixin")
+
+
 @dataclass
 class UnitModule:
     module_name: str
@@ -97,47 +184,54 @@ class UnitModule:
         return self.test_case_folder / "src" / f"{self.function_name}.c"
 
 
-def split_unity_tests(relative_dir):
-    import os
-    import re
-
-    # Regex aggiornata:
-    # trova funzioni void test_XXX(void) oppure void testXXX(void)
-    FUNC_RE = re.compile(
-        r'\bvoid\s+(test_[A-Za-z0-9_]*|test[A-Za-z0-9_]*)\s*\(\s*void\s*\)\s*{',
-        re.MULTILINE
+def _match_brace(text, idx: int) -> int:
+    """
+    Index of the "}" closing the block opened at text[idx], -1 if unbalanced.
+    Jumps from brace to brace with find() instead of visiting every character;
+    text may be a str or a bytes-like object (bytes, mmap).
+    """
+    open_brace, close_brace = ("{", "}") if isinstance(text, str) else (b"{", b"}")
+    depth = 0
+    next_open = text.find(open_brace, idx)
+    next_close = text.find(close_brace, idx)
+    while next_close != -1:
+        if next_open != -1 and next_open < next_close:
+            depth += 1
+            next_open = text.find(open_brace, next_open + 1)
+        else:
+            depth -= 1
+            if depth == 0:
+                return next_close
+            next_close = text.find(close_brace, next_close + 1)
+    return -1
+
+
+@lru_cache(maxsize=512)
+def _header_re(function_name: str) -> re.Pattern:
+    # bytes pattern: searched directly on the mmap of the source file;
+    # the name is escaped, it comes from a folder name
+    return re.compile(
+        FUNCTION_HEADER_TEMPLATE.format(function_name=re.escape(function_name)).encode("utf-8"),
+        re.MULTILINE | re.VERBOSE
     )
 
-    def _match_brace(text, idx):
-        depth = 0
-        i = idx
-        while i < len(text):
-            if text[i] == "{":
-                depth += 1
-            elif text[i] == "}":
-                depth -= 1
-                if depth == 0:
-                    return i
-            i += 1
-        return -1
 
-    def _find_function(text, name):
-        pat = re.compile(r'\bvoid\s+' + re.escape(name) + r'\s*\(\s*void\s*\)\s*{')
-        m = pat.search(text)
-        if not m:
-            return None
-        start = m.start()
-        brace = text.find("{", m.end() - 1)
-        end = _match_brace(text, brace)
-        return text[start:end+1]
+def _decode_source(data: bytes) -> str:
+    # same text read_text(errors="ignore") would give: universal newlines included
+    return data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
 
+def split_unity_tests(relative_dir):
     script_dir = os.path.abspath(os.path.dirname(__file__))
     input_dir = os.path.abspath(os.path.join(script_dir, relative_dir))
 
     if not os.path.isdir(input_dir):
         raise ValueError(f"Directory does not exist: {input_dir}")
 
-    c_files = [f for f in os.listdir(input_dir) if f.startswith("test_") and f.endswith(".c")]
+    # nomi presenti nella cartella, aggiornati a ogni file scritto: niente os.path.exists per test
+    dir_names = os.listdir(input_dir)
+    existing_names = set(dir_names)
+    c_files = [f for f in dir_names if f.startswith("test_") and f.endswith(".c")]
     if not c_files:
         raise RuntimeError("No test_*.c files found.")
 
@@ -145,39 +239,55 @@ def split_unity_tests(relative_dir):
 
     for c_file in c_files:
         c_path = os.path.join(input_dir, c_file)
-        with open(c_path, "r", encoding="utf-8") as f:
-            text = f.read()
-
-        setup = _find_function(text, "setUp")
-        teardown = _find_function(text, "tearDown")
-
+        # letto e riscritto come bytes: nessuna decodifica/ricodifica del sorgente
+        # (newline normalizzati come faceva la lettura in modalità testo)
+        with open(c_path, "rb") as f:
+            text = f.read().replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+        # un solo passaggio sul file: setUp, tearDown e test classificati per nome,
+        # con la posizione di inizio già nota dal match
+        setup = teardown = None
+        setup_start = teardown_start = None
         tests = []
-        for m in FUNC_RE.finditer(text):
-            name = m.group(1)  # già cattura test_X o testX
-            brace = text.find("{", m.end() - 1)
-            end = _match_brace(text, brace)
-            tests.append((name, text[m.start():end+1]))
+        for m in UNITY_FUNC_RE.finditer(text):
+            name = m.group(1).decode("ascii")  # setUp, tearDown, test_X o testX
+            start = m.start()
+            end = _match_brace(text, m.end() - 1)
+            if name == "setUp":
+                if setup is None:
+                    setup, setup_start = text[start:end+1], start
+            elif name == "tearDown":
+                if teardown is None:
+                    teardown, teardown_start = text[start:end+1], start
+            else:
+                tests.append((name, start, text[start:end+1]))
 
         if not tests:
             continue
 
         indices = []
         if setup:
-            indices.append(text.index(setup))
+            indices.append(setup_start)
         if teardown:
-            indices.append(text.index(teardown))
+            indices.append(teardown_start)
 
         if indices:
             preamble_end = min(indices)
         else:
-            first_test_start = min(text.index(snippet) for _, snippet in tests)
-            preamble_end = first_test_start
+            preamble_end = min(start for _, start, _ in tests)
 
-        preamble = text[:preamble_end].rstrip() + "\n\n"
+        preamble = text[:preamble_end].rstrip() + b"\n\n"
+        # parte comune a tutti i file generati
+        head = preamble
+        if setup:
+            head += setup + b"\n\n"
+        if teardown:
+            head += teardown + b"\n\n"
 
-        for name, body in tests:
-            base_no_ext = os.path.splitext(c_file)[0]
-            base_core = base_no_ext[5:] if base_no_ext.startswith("test_") else base_no_ext
+        base_no_ext = os.path.splitext(c_file)[0]
+        base_core = base_no_ext[5:] if base_no_ext.startswith("test_") else base_no_ext
+
+        for name, _, body in tests:
 
             # Rimuove prefisso test_ o test
             if name.startswith("test_"):
@@ -194,21 +304,17 @@ def split_unity_tests(relative_dir):
             else:
                 output_name = func_core
 
-            out_path = os.path.join(input_dir, f"test_{output_name}.c")
+            out_name = f"test_{output_name}.c"
 
-            if os.path.exists(out_path):
+            if out_name in existing_names:
                 counter = 1
-                while os.path.exists(os.path.join(input_dir, f"test_{output_name}_{counter}.c")):
+                while f"test_{output_name}_{counter}.c" in existing_names:
                     counter += 1
-                out_path = os.path.join(input_dir, f"test_{output_name}_{counter}.c")
+                out_name = f"test_{output_name}_{counter}.c"
+            existing_names.add(out_name)
 
-            with open(out_path, "w", encoding="utf-8") as out:
-                out.write(preamble)
-                if setup:
-                    out.write(setup + "\n\n")
-                if teardown:
-                    out.write(teardown + "\n\n")
-                out.write(body + "\n")
+            # un solo open/write/close a basso livello per file, senza TextIOWrapper
+            write_bytes_fd(os.path.join(input_dir, out_name), head + body + b"\n")
 
     for orig in original_files:
         try:
@@ -217,35 +323,155 @@ def split_unity_tests(relative_dir):
             pass
 
 
-def find_function_definition(root: Path, func_name: str):
-    results = []
-    pattern = re.compile(rf"\b{func_name}\s*\([^)]*\)", re.IGNORECASE)
+@lru_cache(maxsize=None)
+def _definitions_pattern(func_names: tuple[str, ...]) -> re.Pattern:
+    # a single alternation for all the names: every file is scanned once, whatever their number.
+    # The lookahead leaves the call/parameter list unconsumed, so "f(g(x))" still reports g;
+    # [^\S\n] / [^)\n]: the match must stay on one line, as with the old per-line scan
+    alternatives = b"|".join(re.escape(name.encode()) for name in func_names)
+    return re.compile(
+        rb"\b(" + alternatives + rb")(?=[^\S\n]*\([^)\n]*\))",
+        re.IGNORECASE,
+    )
+
+
+def load_function_index() -> dict[str, list]:
+    """{file path: [st_mtime_ns, st_size, [identifier.lower(), ...]]} from the previous run."""
+    try:
+        with FUNCTION_INDEX_FILE.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        warn(f"Ignoring unreadable function index '{FUNCTION_INDEX_FILE}': {e}")
+        return {}
+    if not isinstance(data, dict) or data.get("version") != FUNCTION_INDEX_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
 
-    for c_file in root.rglob("*.c"):
+def save_function_index(index: dict[str, list]) -> None:
+    try:
+        FUNCTION_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = FUNCTION_INDEX_FILE.with_name(FUNCTION_INDEX_FILE.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"version": FUNCTION_INDEX_VERSION, "files": index}, f, separators=(",", ":"))
+        os.replace(tmp, FUNCTION_INDEX_FILE)
+    except OSError as e:
+        warn(f"Could not save function index '{FUNCTION_INDEX_FILE}': {e}")
+
+
+def _scan_definitions(c_file: Path, data, pattern: re.Pattern, results: dict[str, list]) -> None:
+    # one C-level scan of the whole file, line numbers recovered only for the hits
+    seen_lines = set()
+    line_no, pos = 1, 0
+    for m in pattern.finditer(data):
+        start = m.start()
+        line_start = data.rfind(b"\n", 0, start) + 1
+        key = m.group(1).decode("ascii", errors="ignore").lower()
+        if (key, line_start) in seen_lines:
+            continue  # one result per line
+        seen_lines.add((key, line_start))
+        line_no += data[pos:start].count(b"\n")  # mmap has no count()
+        pos = start
+        line_end = data.find(b"\n", start)
+        if line_end == -1:
+            line_end = len(data)
+        line = data[line_start:line_end].decode("utf-8", errors="ignore")
+        results.setdefault(key, []).append((c_file, line_no, line.strip()))
+
+
+def find_function_definitions(c_files, func_names, index: Optional[dict[str, list]] = None) -> dict[str, list]:
+    """
+    Scan every file in c_files once for all func_names.
+    Returns {func_name.lower(): [(c_file, line_no, line), ...]} in file order.
+
+    index (see load_function_index) lists the identifiers followed by "(" in each file:
+    files unchanged since (same mtime/size) and naming none of func_names are not read at all.
+    Entries of the files read are refreshed in place.
+    """
+    results: dict[str, list] = {}
+    names = tuple(sorted({name for name in func_names if name}))
+    if not names:
+        return results
+    pattern = _definitions_pattern(names)
+    wanted = {name.lower() for name in names}
+    use_index = index is not None and all(IDENTIFIER_RE.fullmatch(name) for name in names)
+
+    for c_file in c_files:
+        key_path = str(c_file)
         try:
-            with c_file.open("r", encoding="utf-8", errors="ignore") as f:
-                for i, line in enumerate(f, start=1):
-                    if pattern.search(line):
-                        results.append((c_file, i, line.strip()))
+            if use_index:
+                st = os.stat(c_file)
+                entry = index.get(key_path)
+                if (
+                    entry is not None
+                    and entry[0] == st.st_mtime_ns
+                    and entry[1] == st.st_size
+                    and wanted.isdisjoint(entry[2])
+                ):
+                    continue
+            with open(c_file, "rb") as fh:
+                if not use_index:
+                    st = os.fstat(fh.fileno())
+                # mmap: pages are mapped on demand, no bytes copy of the whole file
+                data = (
+                    mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                    if st.st_size else b""
+                )
         except Exception as e:
             warn(f"Error reading '{c_file}': {e}")
+            continue
+        try:
+            _scan_definitions(c_file, data, pattern, results)
+            if index is not None:
+                # stat taken before the read: a file modified meanwhile just gets rescanned next time
+                index[key_path] = [
+                    st.st_mtime_ns,
+                    st.st_size,
+                    sorted({m.group(1).decode("ascii").lower() for m in IDENTIFIER_CALL_RE.finditer(data)}),
+                ]
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
     return results
 
 
+def find_function_definition(root: Path, func_name: str):
+    return find_function_definitions(root.rglob("*.c"), (func_name,)).get(func_name.lower(), [])
+
+
 def build_modules(root: Path):
     modules = []
 
-    for test_dir in root.rglob("*"):
-        if not test_dir.is_dir():
-            continue
-        if not test_dir.name.startswith(UNIT_TEST_PREFIX):
-            continue
-
-        func_name = test_dir.name.replace(UNIT_TEST_PREFIX, "", 1)
+    test_dirs = []
+    c_files = []
+    # os.walk: only directory names are inspected, no Path object per file;
+    # the .c files are collected in the same walk
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]  # .git, .vscode, ...
+        for d in dirnames:
+            if d.startswith(UNIT_TEST_PREFIX):
+                test_dirs.append(Path(dirpath, d))
+        c_files.extend(Path(dirpath, f) for f in filenames if f.endswith(".c"))
+
+    func_names = [d.name.replace(UNIT_TEST_PREFIX, "", 1) for d in test_dirs]
+    # every source is read once for all the test folders, instead of once per folder,
+    # and not at all when the index of the previous run shows it names none of them
+    index = load_function_index()
+    definitions = find_function_definitions(c_files, func_names, index)
+    live = {str(c_file) for c_file in c_files}
+    save_function_index({path: entry for path, entry in index.items() if path in live})
+
+    for test_dir, func_name in zip(test_dirs, func_names):
         test_root = test_dir.parent
         search_root = test_root.parent
 
-        matches = find_function_definition(search_root, func_name)
+        matches = [
+            hit for hit in definitions.get(func_name.lower(), ())
+            if search_root in hit[0].parents
+        ]
 
         if matches:
             file_path, _, _ = matches[0]
@@ -273,65 +499,39 @@ def find_and_extract_function(file_name: str, function_name: str, unit_path: Pat
         return None
 
     try:
-        content = file_path.read_text(encoding="utf-8", errors="ignore")
-
-        function_pattern = re.compile(
-            rf"""
-            (?P<header>
-                ^[ \t]*
-                (?P<before>[^\n]*?)
-                \b{function_name}\b
-                \s*
-                (?P<params>\([^)]*\))
-                (?P<post_attr>
-                    (?:\s*__attribute__\s*\(\([^)]*\)\))*
-                )
-            )
-            \s*\{{
-            """,
-            re.MULTILINE | re.VERBOSE
-        )
-
-        match = function_pattern.search(content)
-        if not match:
-            warn(f"Function '{function_name}' not found in '{file_name}'.")
-            return None
-
-        brace_index = content.find("{", match.end("header"))
-        if brace_index == -1:
-            warn(f"Opening brace for function '{function_name}' not found in '{file_name}'.")
-            return None
-
-        open_braces = 0
-        end_index = None
-        for i in range(brace_index, len(content)):
-            char = content[i]
-            if char == "{":
-                open_braces += 1
-            elif char == "}":
-                open_braces -= 1
-                if open_braces == 0:
-                    end_index = i
-                    break
-
-        if end_index is None:
-            warn(f"Closing brace for function '{function_name}' not found in '{file_name}'.")
-            return None
-
-        before = match.group("before") or ""
-        params = match.group("params")
-
-        before_clean = re.sub(r'__attribute__\s*\(\([^)]*\)\)\s*', ' ', before)
-        before_clean = re.sub(
-            r'\b(static|inline|INLINE|extern|constexpr|volatile|register|__inline__|__forceinline)\b',
-            ' ',
-            before_clean
-        )
+        # mmap: the file is searched in place, only the extracted function gets decoded
+        with open(file_path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                warn(f"Function '{function_name}' not found in '{file_name}'.")
+                return None
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                function_pattern = _header_re(function_name)
+
+                match = function_pattern.search(content)
+                if not match:
+                    warn(f"Function '{function_name}' not found in '{file_name}'.")
+                    return None
+
+                brace_index = content.find(b"{", match.end("header"))
+                if brace_index == -1:
+                    warn(f"Opening brace for function '{function_name}' not found in '{file_name}'.")
+                    return None
+
+                end_index = _match_brace(content, brace_index)
+                if end_index == -1:
+                    warn(f"Closing brace for function '{function_name}' not found in '{file_name}'.")
+                    return None
+
+                before = _decode_source(match.group("before") or b"")
+                params = _decode_source(match.group("params"))
+                body_part = _decode_source(content[brace_index:end_index + 1])
+
+        before_clean = ATTRIBUTE_RE.sub(' ', before)
+        before_clean = QUALIFIER_RE.sub(' ', before_clean)
         before_clean = before_clean.replace('\t', ' ')
         return_type = ' '.join(before_clean.split()) or "void"
 
         clean_header = f"{return_type} {function_name}{params}"
-        body_part = content[brace_index:end_index + 1]
         return f"\n\n{clean_header} {body_part}"
 
     except Exception as e:
@@ -343,12 +543,15 @@ def modify_file_after_marker(file_path: Path, new_content: str):
     marker = "/* FUNCTION TO TEST */"
     try:
         content = file_path.read_text(encoding="utf-8", errors="ignore")
-        marker_index = content.find(marker)
-        if marker_index == -1:
+        head, found, _ = content.partition(marker)
+        if not found:
             fatal(f"Marker '{marker}' not found in file: {file_path}")
 
-        modified_content = content[:marker_index + len(marker)] + "\n" + new_content + "\n"
-        file_path.write_text(modified_content, encoding="utf-8")
+        # new file + rename: atomic, and never writes through a hardlink shared
+        # with a copy of the test folder
+        tmp_path = file_path.with_name(file_path.name + ".tmp")
+        tmp_path.write_text(f"{head}{marker}\n{new_content}\n", encoding="utf-8")
+        os.replace(tmp_path, file_path)
         info(f"Updated file: {file_path}")
     except FileNotFoundError:
         fatal(f"File not found: {file_path}")
@@ -357,75 +560,155 @@ def modify_file_after_marker(file_path: Path, new_content: str):
 
 
 def extract_function_name(path_str: str) -> str:
-    filename = Path(path_str).name
-    name_no_ext = Path(filename).stem
+    # plain string ops, no Path objects: same name as Path(path_str).stem, trailing separator ignored
+    filename = os.path.basename(path_str.rstrip("/\\" if os.altsep else "/"))
+    name_no_ext = os.path.splitext(filename)[0]
     if name_no_ext.startswith(UNIT_TEST_PREFIX):
         return name_no_ext[len(UNIT_TEST_PREFIX):]
     return name_no_ext
 
 
-def update_unit_under_test(module: UnitModule, unit_name: str):
+def inject_function_under_test(module: UnitModule):
     extracted_body = find_and_extract_function(module.module_name, module.function_name, module.source_dir)
     if extracted_body is None:
         fatal(f"Cannot extract body for function '{module.function_name}' in module '{module.module_name}'")
 
     modify_file_after_marker(module.test_c_path, extracted_body)
-    clear_folder(UNIT_EXECUTION_FOLDER)
-    copy_folder_contents(module.test_case_folder, UNIT_EXECUTION_FOLDER)
+
+
+def stage_unit_under_test(module: UnitModule, execution_folder: Path = UNIT_EXECUTION_FOLDER):
+    clear_folder(execution_folder)
+    # test sources are only read by Ceedling (split_unity_tests writes new files): hardlink them
+    copy_folder_contents(module.test_case_folder, execution_folder, link=True)
 
 
 def load_result_rows(summary_file: Path) -> dict[str, TestResultRow]:
     rows: dict[str, TestResultRow] = {}
-    if not summary_file.exists() or summary_file.stat().st_size == 0:
-        return rows
-
-    text = summary_file.read_text(encoding="utf-8", errors="ignore")
-    lines = text.splitlines()
-    if not lines:
+    try:
+        if summary_file.stat().st_size == 0:
+            return rows
+    except FileNotFoundError:
         return rows
 
-    header_csv = "function_name,test_name,status,linesCvrg,branchesCvrg"
-
-    header_line = lines[0].strip()
-    if "function_name" not in header_line:
-        header_line = header_csv
-
-    headers = [h.strip() for h in header_line.split(",")]
-    hmap = {name: i for i, name in enumerate(headers)}
-
-    def hget(row_parts, name, default=""):
-        i = hmap.get(name, -1)
-        return row_parts[i].strip() if 0 <= i < len(row_parts) else default
-
-    for line in lines[1:]:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        parts = [p.strip() for p in stripped.split(",")]
+    # csv module: the row splitting runs in the _csv C extension
+    with summary_file.open("r", encoding="utf-8", errors="ignore", newline="") as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return rows
+
+        headers = [h.strip() for h in first]
+        if "function_name" not in headers:
+            headers = list(RESULT_HEADER)
+        hmap = {name: i for i, name in enumerate(headers)}
+        # column positions resolved once, not looked up again for every row and field
+        i_function, i_test, i_status, i_lines, i_branches = (hmap.get(name, -1) for name in RESULT_HEADER)
+
+        def cell(row_parts, i):
+            return row_parts[i].strip() if 0 <= i < len(row_parts) else ""
+
+        for parts in reader:
+            tn = cell(parts, i_test)
+            if not tn:
+                continue
+
+            fn = cell(parts, i_function)
+            rows[f"{fn}:{tn}"] = TestResultRow(
+                module_function_name=fn,
+                test_name=tn,
+                status=cell(parts, i_status),
+                linesCvrg=cell(parts, i_lines),
+                branchesCvrg=cell(parts, i_branches),
+            )
 
-        tn = hget(parts, "test_name")
-        if not tn:
-            continue
+    return rows
 
-        key = f"{hget(parts, 'function_name')}:{tn}"
-        rows[key] = TestResultRow(
-            module_function_name=hget(parts, "function_name"),
-            test_name=tn,
-            status=hget(parts, "status"),
-            linesCvrg=hget(parts, "linesCvrg"),
-            branchesCvrg=hget(parts, "branchesCvrg"),
-        )
 
-    return rows
+COVERAGE_LABELS = ("Lines:", "Branches:")
+# riga di riepilogo gcovr: <tr><th scope="row">Lines:</th><td>..</td><td>..</td><td>83.3%</td></tr>
+COVERAGE_XPATH = '//tr[th[@scope="row"][normalize-space()=$label]]/td[3]'
+
+
+class _CoverageSummaryParser(HTMLParser):
+    """
+    Fallback without lxml: one streaming pass, cell text of the 3rd <td> of the rows
+    whose <th scope="row"> is one of COVERAGE_LABELS. Stops at the summary table,
+    the per-file table that follows it is never parsed.
+    """
+
+    class Done(Exception):
+        pass
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.values: dict[str, str] = {}
+        self._label: Optional[str] = None   # label of the current row, once its <th> is closed
+        self._th: Optional[list[str]] = None
+        self._td: Optional[list[str]] = None
+        self._td_count = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._label, self._th, self._td, self._td_count = None, None, None, 0
+        elif tag == "th" and ("scope", "row") in attrs:
+            self._th = []
+        elif tag == "td" and self._label is not None:
+            self._td_count += 1
+            if self._td_count == 3:
+                self._td = []
+
+    def handle_endtag(self, tag):
+        if tag == "th" and self._th is not None:
+            label = "".join(self._th).strip()
+            self._th = None
+            if label in COVERAGE_LABELS and label not in self.values:
+                self._label = label
+        elif tag == "td" and self._td is not None:
+            self.values[self._label] = "".join(self._td).strip()
+            self._label, self._td = None, None
+            if len(self.values) == len(COVERAGE_LABELS):
+                raise self.Done()
+        elif tag == "tr":
+            self._label, self._th, self._td = None, None, None
+
+    def handle_data(self, data):
+        if self._td is not None:
+            self._td.append(data)
+        elif self._th is not None:
+            self._th.append(data)
+
+
+def extract_coverage_summary(html: str) -> tuple[Optional[str], Optional[str]]:
+    """(lines, branches) percentages of a gcovr HTML report, None when missing."""
+    if HAVE_LXML:
+        # C parser, one parse for both rows
+        try:
+            doc = lxml_html.fromstring(html)
+        except (ValueError, etree.ParserError):
+            doc = None
+        if doc is not None:
+            values = []
+            for label in COVERAGE_LABELS:
+                cells = doc.xpath(COVERAGE_XPATH, label=label)
+                value = cells[0].text_content().strip() if cells else ""
+                values.append(value or None)
+            return values[0], values[1]
+
+    parser = _CoverageSummaryParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _CoverageSummaryParser.Done:
+        pass
+    return parser.values.get("Lines:") or None, parser.values.get("Branches:") or None
 
 
-def update_total_result_report(build_folder: Path, function_name: str, report_folder: Path):
+def collect_result_rows(build_folder: Path, function_name: str) -> dict[str, TestResultRow]:
+    """Rows for one unit, read from its Ceedling build folder (.pass/.fail results + gcovr HTML)."""
     results_dir = build_folder / "gcov" / "results"
     coverage_dir = build_folder / "artifacts" / "gcov" / "gcovr"
     coverage_file = None
 
-    now_str = datetime.now().strftime("%d/%m/%y %H:%M")
-
     # Cerca tutti gli HTML che iniziano con "GcovCoverageResults." ma NON contengono "_help"
     html_candidates = sorted(coverage_dir.glob("GcovCoverageResults*.html"))
     for cand in html_candidates:
@@ -436,17 +719,25 @@ def update_total_result_report(build_folder: Path, function_name: str, report_fo
     if coverage_file is None:
         warn("Nessun file HTML di coverage valido trovato (tutti contenevano '_help').")
 
-
-    now_str = datetime.now().strftime("%d/%m/%y %H:%M")
-
-    report_folder.mkdir(parents=True, exist_ok=True)
-    summary_file = report_folder / RESULT_REPORT
-    rows = load_result_rows(summary_file)
+    rows: dict[str, TestResultRow] = {}
 
     # ---------------------------------------------------------------------
     # Collect all .pass and .fail files inside gcov/results/
     # ---------------------------------------------------------------------
-    test_files = list(results_dir.glob("*.pass")) + list(results_dir.glob("*.fail"))
+    # one scandir, names kept as str: no Path per entry; .pass first, then .fail, as before
+    passed_names: list[str] = []
+    failed_names: list[str] = []
+    try:
+        with os.scandir(results_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith(".pass"):
+                    passed_names.append(name)
+                elif name.endswith(".fail"):
+                    failed_names.append(name)
+    except FileNotFoundError:
+        pass
+    test_files = passed_names + failed_names
 
 
 
@@ -454,8 +745,8 @@ def update_total_result_report(build_folder: Path, function_name: str, report_fo
 
     # Extract function name from file name (remove extension)
     # E.g. "test_myFunc.pass" → "myFunc"
-    def extract_func_name(path: Path) -> str:
-        name = path.stem  # "test_myFunc"
+    def extract_func_name(file_name: str) -> str:
+        name = file_name[:-5]  # "test_myFunc" (".pass" / ".fail")
         if name.startswith("test_"):
             return name[5:]
         return name
@@ -463,23 +754,12 @@ def update_total_result_report(build_folder: Path, function_name: str, report_fo
     # ---------------------------------------------------------------------
     # Extract coverage from HTML if available
     # ---------------------------------------------------------------------
-    def extract_coverage(html: str, label: str) -> Optional[str]:
-        row_re = re.compile(
-            rf"<tr>\s*<th[^>]*scope=\"row\"[^>]*>\s*{re.escape(label)}\s*</th>\s*"
-            rf"<td[^>]*>.*?</td>\s*<td[^>]*>.*?</td>\s*<td[^>]*>(?P<pct>[^<]+)</td>\s*</tr>",
-            re.IGNORECASE | re.DOTALL,
-        )
-        m = row_re.search(html)
-        return m.group("pct").strip() if m else None
-
-    html = None
     linesCvrg, branchesCvrg = None, None
 
     if coverage_file is not None and coverage_file.exists():
         try:
             html = coverage_file.read_text(encoding="utf-8", errors="ignore")
-            linesCvrg = extract_coverage(html, "Lines:")
-            branchesCvrg = extract_coverage(html, "Branches:")
+            linesCvrg, branchesCvrg = extract_coverage_summary(html)
         except Exception as e:
             warn(f"Error reading coverage file '{coverage_file}': {e}")
     else:
@@ -505,7 +785,7 @@ def update_total_result_report(build_folder: Path, function_name: str, report_fo
         # ---------------------------------------------------------------------
         for f in test_files:
             test_name = extract_func_name(f)
-            passed = f.suffix == ".pass"
+            passed = f.endswith(".pass")
 
 
             key = f"{function_name}:{test_name}"
@@ -516,77 +796,306 @@ def update_total_result_report(build_folder: Path, function_name: str, report_fo
                 linesCvrg=linesCvrg or "-",
                 branchesCvrg=branchesCvrg or "-",
             )
-            
+
+    return rows
+
+
+def write_total_result_report(report_folder: Path, rows: dict[str, TestResultRow]):
+    """
+    Write the CSV summary once, at the end of the run: the rows of every unit are
+    kept in memory by the caller (load_result_rows + update) instead of re-reading
+    and rewriting the growing file after each unit.
+    """
+    report_folder.mkdir(parents=True, exist_ok=True)
+    summary_file = report_folder / RESULT_REPORT
+
     # ---------------------------------------------------------------------
     # Write CSV (no Tester column)
     # ---------------------------------------------------------------------
-    header = "function_name,test_name,status,linesCvrg,branchesCvrg"
-    lines_out = [header] + [row.to_csv_line() for row in rows.values()]
-    summary_file.write_text("\n".join(lines_out) + "\n", encoding="utf-8")
-    print(rows)
-    info(f"Updated summary for {len(test_files)} test results → {summary_file}")
-
-
-def format_total_result_report(report_folder: Path):
+    # rows streamed straight into the file: no list of lines, no joined copy of the report
+    with summary_file.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(RESULT_HEADER)
+        writer.writerows(row.fields() for row in rows.values())
+    info(f"Updated summary for {len(rows)} test results → {summary_file}")
+
+
+def format_total_result_report(report_folder: Path, rows: dict[str, TestResultRow]):
+    """
+    Rewrite the summary as an aligned markdown table, from the rows already in
+    memory (the ones write_total_result_report just wrote): the CSV is not parsed back.
+    """
     summary_file = report_folder / RESULT_REPORT
     if not summary_file.exists():
         warn(f"Summary file does not exist: {summary_file}")
         return
 
-    lines = summary_file.read_text(encoding="utf-8", errors="ignore").splitlines()
-    if not lines:
-        warn(f"Summary file is empty: {summary_file}")
-        return
-
-    header_parts = [h.strip() for h in lines[0].split(",") if h.strip()]
-    if not header_parts:
-        warn(f"Invalid header in summary file: {summary_file}")
-        return
-
-    data_rows: list[list[str]] = []
-    for line in lines[1:]:
-        if not line.strip():
-            continue
-        parts = [p.strip() for p in line.split(",")]
-        if len(parts) < len(header_parts):
-            parts.extend([""] * (len(header_parts) - len(parts)))
-        data_rows.append(parts[:len(header_parts)])
-
-    if not data_rows:
+    if not rows:
         warn(f"No data rows to format: {summary_file}")
         return
 
-    col_widths: list[int] = []
-    for col_idx, header in enumerate(header_parts):
-        max_data_len = max(len(row[col_idx]) for row in data_rows)
-        col_widths.append(max(len(header), max_data_len))
+    data_rows = [row.fields() for row in rows.values()]
+    # one pass over the rows for all the column widths
+    col_widths = [len(h) for h in RESULT_HEADER]
+    for row in data_rows:
+        for i, cell in enumerate(row):
+            if len(cell) > col_widths[i]:
+                col_widths[i] = len(cell)
 
-    header_line = "| " + " | ".join(header_parts[i].ljust(col_widths[i]) for i in range(len(header_parts))) + " |\n"
-    separator_line = "|" + "|".join("-" * (col_widths[i] + 2) for i in range(len(col_widths))) + "|\n"
+    header_line = "| " + " | ".join(h.ljust(w) for h, w in zip(RESULT_HEADER, col_widths)) + " |\n"
+    separator_line = "|" + "|".join("-" * (w + 2) for w in col_widths) + "|\n"
 
-    row_lines = ""
+    # StringIO: linear in the report size, unlike += on a growing str
+    buf = io.StringIO()
+    buf.write(header_line)
+    buf.write(separator_line)
     for row in data_rows:
-        row_lines += "| " + " | ".join(row[i].ljust(col_widths[i]) for i in range(len(row))) + " |\n"
+        buf.write("| ")
+        buf.write(" | ".join(cell.ljust(width) for cell, width in zip(row, col_widths)))
+        buf.write(" |\n")
 
-    summary_file.write_text(header_line + separator_line + row_lines, encoding="utf-8")
+    summary_file.write_text(buf.getvalue(), encoding="utf-8")
     info(f"Formatted summary report: {summary_file}")
 
 
-def run_and_collect_results(module: UnitModule):
+def _hash_files(h, root: Path) -> None:
+    # relative path, size and content of every file under root, in a stable order
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            h.update(f"{os.path.relpath(path, root)}\0{len(data)}\0".encode("utf-8"))
+            h.update(data)
+
+
+def unit_inputs_hash(module: UnitModule) -> str:
+    """
+    Digest of everything the Ceedling build of a unit sees: its test case folder
+    (function under test already injected), the Ceedling project files and the image.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{UNIT_CACHE_VERSION}\0{CEEDLING_IMAGE}\0".encode("utf-8"))
+    for name in CEEDLING_PROJECT_FILES:
+        src = DEFAULT_WORKSPACE.mount_source / name
+        h.update(f"{name}\0".encode("utf-8"))
+        if src.is_file():
+            h.update(src.read_bytes())
+        elif src.is_dir():
+            _hash_files(h, src)
+    _hash_files(h, module.test_case_folder)
+    return h.hexdigest()
+
+
+def _has_entries(folder: Path) -> bool:
+    """folder exists and is not empty."""
+    try:
+        with os.scandir(folder) as it:
+            return next(it, None) is not None
+    except OSError:
+        return False
+
+
+def load_cached_unit(function_name: str, inputs_hash: str) -> Optional[dict[str, TestResultRow]]:
+    """Rows of the last run of the unit if its inputs were the same, else None."""
+    stamp = UNIT_CACHE_FOLDER / f"{function_name}.json"
+    try:
+        with stamp.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        warn(f"Ignoring unreadable unit stamp '{stamp}': {e}")
+        return None
+    if not isinstance(data, dict) or data.get("inputs") != inputs_hash:
+        return None
+    if not _has_entries(UNIT_CACHE_FOLDER / f"{function_name}Results"):
+        return None
+    try:
+        rows = [TestResultRow(*fields) for fields in data["rows"]]
+    except (KeyError, TypeError):
+        return None
+    return {f"{row.module_function_name}:{row.test_name}": row for row in rows}
+
+
+def save_cached_unit(function_name: str, inputs_hash: str, rows: dict[str, TestResultRow]) -> None:
+    results = UNIT_RESULT_FOLDER / f"{function_name}Results"
+    stamp = UNIT_CACHE_FOLDER / f"{function_name}.json"
+    try:
+        UNIT_CACHE_FOLDER.mkdir(parents=True, exist_ok=True)
+        # old stamp first: never left paired with a half-replaced results folder
+        stamp.unlink(missing_ok=True)
+        if not _has_entries(results):
+            return
+        cached = UNIT_CACHE_FOLDER / results.name
+        copy_entire_folder(results, cached, link=True)
+        # copy_entire_folder only warns on failure: no stamp without the results it stands for
+        if not _has_entries(cached):
+            warn(f"Results of '{function_name}' not cached: no unit stamp written")
+            return
+        tmp = stamp.with_name(stamp.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"inputs": inputs_hash, "rows": [row.fields() for row in rows.values()]}, f)
+        os.replace(tmp, stamp)
+    except OSError as e:
+        warn(f"Could not save unit stamp '{stamp}': {e}")
+
+
+def run_and_collect_results(
+    module: UnitModule,
+    workspace: ExecutionWorkspace = DEFAULT_WORKSPACE,
+    force: bool = False,
+) -> dict[str, TestResultRow]:
     function_name = module.function_name
-    update_unit_under_test(module, function_name)
-    split_unity_tests(UNIT_EXECUTION_FOLDER_TEST)
-    run_cmd(DOCKER_CLEAN, check=True)
-    run_cmd(DOCKER_BASE + ["ceedling", f"gcov:all"], check=True, stopScript=False)
-    update_total_result_report(UNIT_EXECUTION_FOLDER_BUILD, function_name, UNIT_RESULT_FOLDER)
-    copy_folder_contents(UNIT_EXECUTION_FOLDER_BUILD, UNIT_RESULT_FOLDER / f"{function_name}Results")
+    inject_function_under_test(module)
+
+    # same test folder, function body and Ceedling setup as last time: same results,
+    # no staging and no Docker
+    inputs_hash = unit_inputs_hash(module)
+    if not force:
+        rows = load_cached_unit(function_name, inputs_hash)
+        if rows is not None:
+            info(f"Inputs of '{function_name}' unchanged: reusing the previous results")
+            copy_entire_folder(
+                UNIT_CACHE_FOLDER / f"{function_name}Results",
+                UNIT_RESULT_FOLDER / f"{function_name}Results",
+                link=True,
+            )
+            return rows
+
+    stage_unit_under_test(module, workspace.execution_folder)
+    split_unity_tests(workspace.test_folder)
+    run_cmd(workspace.docker_base + CEEDLING_GCOV_ALL, check=True, stopScript=False)
+    rows = collect_result_rows(workspace.build_folder, function_name)
+    # the build folder is cleared with the next unit anyway: rename it instead of copying it
+    move_folder(workspace.build_folder, UNIT_RESULT_FOLDER / f"{function_name}Results")
+    # a unit without results (e.g. Docker failure) is retried next time
+    if all(row.status != "NOT EXC" for row in rows.values()):
+        save_cached_unit(function_name, inputs_hash, rows)
+    return rows
+
+
+def create_workspace(root: Path) -> ExecutionWorkspace:
+    """Private copy of the Ceedling project under root, same layout as DEFAULT_WORKSPACE."""
+    base = DEFAULT_WORKSPACE
+    workspace = ExecutionWorkspace(
+        root,
+        root / base.execution_folder.relative_to(base.mount_source),
+        root / base.test_folder.relative_to(base.mount_source),
+        root / base.build_folder.relative_to(base.mount_source),
+    )
+    workspace.execution_folder.mkdir(parents=True, exist_ok=True)
+    for name in CEEDLING_PROJECT_FILES:
+        src = base.mount_source / name
+        if src.is_dir():
+            copy_entire_folder(src, root / name, link=True)
+        elif src.is_file():
+            link_or_copy(str(src), str(root / name))
+    return workspace
+
+
+def start_container(workspace: ExecutionWorkspace, name: str) -> ExecutionWorkspace:
+    """
+    Start a detached container on the workspace mount, kept alive for the whole run:
+    the returned workspace runs its Ceedling commands there with docker exec, paying
+    the container startup once instead of twice per unit.
+    If the container cannot be started the workspace keeps using one docker run per command.
+    """
+    cmd = [
+        "docker", "run", "-d", "--rm",
+        "--name", name,
+        "-v", f"{docker_mount_path(workspace.mount_source)}:{CONTAINER_PROJECT_DIR}",
+        CEEDLING_IMAGE,
+        "sleep", "infinity",
+    ]
+    p = run_cmd(cmd, check=False, stopScript=False)
+    if p.returncode != 0:
+        warn(f"Could not start container '{name}': falling back to one 'docker run' per command.")
+        return workspace
+    return replace(workspace, container=name)
+
+
+def stop_containers(name_prefix: str) -> None:
+    """Remove every container started by this run (workers included), running or not."""
+    try:
+        p = subprocess.run(
+            ["docker", "ps", "-aq", "--filter", f"name={name_prefix}"],
+            capture_output=True, text=True,
+        )
+        ids = p.stdout.split()
+        if ids:
+            subprocess.run(["docker", "rm", "-f", *ids], capture_output=True)
+    except Exception as e:
+        warn(f"Could not remove containers '{name_prefix}*': {e}")
+
+
+_WORKER_WORKSPACE: Optional[ExecutionWorkspace] = None
+
+
+def _init_unit_worker(workers_root: Path, container_prefix: str) -> None:
+    global _WORKER_WORKSPACE
+    workspace = create_workspace(workers_root / f"worker_{os.getpid()}")
+    _WORKER_WORKSPACE = start_container(workspace, f"{container_prefix}{os.getpid()}")
+
+
+def _unit_worker(module: UnitModule, force: bool) -> dict[str, TestResultRow]:
+    return run_and_collect_results(module, _WORKER_WORKSPACE, force)
+
+
+def run_all_parallel(
+    modules: list[UnitModule],
+    jobs: int,
+    container_prefix: str,
+    summary_rows: dict[str, TestResultRow],
+    force: bool = False,
+) -> None:
+    """
+    Units are independent Ceedling builds: each worker process runs them in its own
+    workspace (own container and build folder). Their rows are merged into
+    summary_rows only here, in submission order, so no locking is needed.
+    Worker containers are named container_prefix + pid and removed by stop_containers.
+    """
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_unit_worker, initargs=(WORKERS_FOLDER, container_prefix)
+    ) as ex:
+        info(f"Processing {len(modules)} units on {jobs} workers")
+        futures = [(ex.submit(_unit_worker, module, force), module) for module in modules]
+        try:
+            for fut, module in futures:
+                try:
+                    rows = fut.result()
+                except subprocess.CalledProcessError:
+                    fatal(f"Unit test failed for '{module.function_name}'. See error details above.")
+                summary_rows.update(rows)
+        finally:
+            # on failure do not start the units still queued
+            for fut, _ in futures:
+                fut.cancel()
+
+
+def parse_options(args: list[str]) -> tuple[Optional[int], bool]:
+    """(jobs, force) from the arguments after the function name."""
+    jobs, force = None, False
+    i = 0
+    while i < len(args):
+        if args[i] == "--force":
+            force = True
+            i += 1
+        elif args[i] in ("-j", "--jobs") and i + 1 < len(args) and args[i + 1].isdigit() and int(args[i + 1]) >= 1:
+            jobs = int(args[i + 1])
+            i += 2
+        else:
+            print_help()
+            sys.exit(1)
+    return jobs, force
 
 
 def print_help():
     script_name = Path(sys.argv[0]).name
     print(f"""
 Usage:
-  python {script_name} <function_name|all>
+  python {script_name} <function_name|all> [-j|--jobs N] [--force]
   python {script_name} -h | --help | help
 """.strip())
 
@@ -614,29 +1123,52 @@ if __name__ == "__main__":
 
     unit_to_test = extract_function_name(sys.argv[1])
     info(f"Selected argument (function to test): {unit_to_test}")
+    jobs, force = parse_options(sys.argv[2:])
 
     modules = build_modules(PROJECT_ROOT)
 
+    # all the containers of this run share this prefix and are removed at exit, also on fatal()
+    container_prefix = f"utlauncher_{os.getpid()}_"
+    atexit.register(stop_containers, container_prefix)
+
+    summary_rows = load_result_rows(UNIT_RESULT_FOLDER / RESULT_REPORT)
+
     if unit_to_test == "all":
-        for module in modules:
-            info(f"Processing unit: {module.function_name}")
-            try:
-                run_and_collect_results(module)
-            except subprocess.CalledProcessError:
-                fatal(f"Unit test failed for '{module.function_name}'. See error details above.")
+        if jobs is None:
+            jobs = min(os.cpu_count() or 1, len(modules))
+        try:
+            UNIT_EXECUTION_FOLDER.relative_to(PATHS.docker_mount_source)
+        except ValueError:
+            if jobs > 1:
+                warn("Execution folder is outside the Docker mount: running the units sequentially.")
+            jobs = 1
+
+        if jobs > 1:
+            run_all_parallel(modules, jobs, container_prefix, summary_rows, force)
+        else:
+            workspace = start_container(DEFAULT_WORKSPACE, f"{container_prefix}main")
+            for module in modules:
+                info(f"Processing unit: {module.function_name}")
+                try:
+                    summary_rows.update(run_and_collect_results(module, workspace, force))
+                except subprocess.CalledProcessError:
+                    fatal(f"Unit test failed for '{module.function_name}'. See error details above.")
     else:
         unit_metadata = [m for m in modules if m.function_name == unit_to_test]
         if not unit_metadata:
             fatal(f"No module found for function '{unit_to_test}'")
 
+        workspace = start_container(DEFAULT_WORKSPACE, f"{container_prefix}main")
         try:
-            run_and_collect_results(unit_metadata[0])
+            summary_rows.update(run_and_collect_results(unit_metadata[0], workspace, force))
         except subprocess.CalledProcessError:
             fatal(f"Unit test failed for '{unit_to_test}'. See error details above.")
 
-    format_total_result_report(UNIT_RESULT_FOLDER)
+    write_total_result_report(UNIT_RESULT_FOLDER, summary_rows)
+    format_total_result_report(UNIT_RESULT_FOLDER, summary_rows)
 
-    copy_entire_folder(UNIT_RESULT_FOLDER, GIT_RESULT)
+    # results are final and utResults is cleared right after: hardlink instead of copying the build artifacts
+    copy_entire_folder(UNIT_RESULT_FOLDER, GIT_RESULT, link=True)
     clear_folder(UNIT_EXECUTION_FOLDER)
     clear_folder(UNIT_RESULT_FOLDER)
     info("Done.")